@@ -2,7 +2,7 @@ from django.apps import AppConfig
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 
-from mongoengine import connection
+from .utils import connection, monitoring
 
 
 class DjangoMongoEngineConfig(AppConfig):
@@ -15,5 +15,7 @@ class DjangoMongoEngineConfig(AppConfig):
         if not hasattr(settings, 'MONGODB_DATABASES'):
             raise ImproperlyConfigured("Missing `MONGODB_DATABASES` in settings.py")
 
-        for alias, conn_settings in settings.MONGODB_DATABASES.items():
-            connection.register_connection(alias, **conn_settings)
+        # the listener has to be registered before any client is created
+        monitoring.install(settings.MONGODB_DATABASES)
+
+        connection.register_connections(settings.MONGODB_DATABASES)
@@ -1,5 +1,6 @@
 from django.db.models import Model
 from django.db.models.base import ModelState
+from django.utils.functional import cached_property
 
 from mongoengine import document as me
 from mongoengine.base import metaclasses as mtc
@@ -25,6 +26,8 @@ def django_meta(meta, *top_bases):
                         new_bases += (b,)
             new_cls = meta.__new__(cls, name, new_bases, attrs)
             new_cls._meta = DocumentMetaWrapper(new_cls)
+            new_cls._state_db = new_cls._meta.get(
+                "db_alias", me.DEFAULT_CONNECTION_NAME)
             return new_cls
 
     return type.__new__(metaclass, 'temporary_meta', (), {})
@@ -35,9 +38,10 @@ class DjangoFlavor(object):
     serializable_value = serializable_value
     _get_pk_val = Model.__dict__["_get_pk_val"]
 
-    def __init__(self, *args, **kwargs):
-        self._state = ModelState(self._meta.get("db_alias", me.DEFAULT_CONNECTION_NAME))
-        super(DjangoFlavor, self).__init__(*args, **kwargs)
+    @cached_property
+    def _state(self):
+        # Built on first access only; most documents never need one.
+        return ModelState(self._state_db)
 
     def _get_unique_checks(self, exclude=None):
         # XXX: source: django/db/models/base.py
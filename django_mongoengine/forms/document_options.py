@@ -11,6 +11,7 @@ except ImportError:
     from django.utils.text import camel_case_to_spaces as get_verbose_name
 
 
+from mongoengine.errors import NotRegistered
 from mongoengine.fields import ReferenceField
 
 
@@ -45,24 +46,25 @@ class DocumentMetaWrapper(object):
     """
     Used to store mongoengine's _meta dict to make the document admin
     as compatible as possible to django's meta class on models.
+
+    The attributes django reads for every field of every row are slots
+    filled once when the document class is created; anything else falls
+    through to the mongoengine meta dict.
     """
-    _pk = None
-    pk_name = None
-    app_label = None
-    model_name = None
-    verbose_name = None
+    __slots__ = (
+        'document', '_meta', 'model', 'concrete_model',
+        'fields', 'concrete_fields', 'local_fields', '_forward_fields_map',
+        '_pk', 'pk_name', 'object_name', 'model_name', 'app_label',
+        'verbose_name', '_field_cache',
+    )
     has_auto_field = False
-    object_name = None
     proxy = []
     virtual_fields = []
-    concrete_fields = []
     proxied_children = []
     parents = {}
     many_to_many = []
+    related_fkey_lookups = []
     swapped = False
-    _field_cache = None
-    document = None
-    _meta = None
 
     def __init__(self, document):
         if isinstance(document._meta, DocumentMetaWrapper):
@@ -73,8 +75,20 @@ class DocumentMetaWrapper(object):
         self._meta = meta or {}
         self.model = document
         self.concrete_model = document
-        self.concrete_fields = document._fields.values()
-        self.fields = self.concrete_fields
+        self._pk = None
+        self.pk_name = None
+        self._field_cache = None
+
+        self.fields = tuple(document._fields[name]
+                            for name in document._fields_ordered)
+        self.concrete_fields = self.local_fields = self.fields
+        forward_fields_map = {}
+        for f in self.fields:
+            forward_fields_map[f.name] = f
+        for f in self.fields:
+            forward_fields_map.setdefault(getattr(f, 'attname', f.name), f)
+            forward_fields_map.setdefault(f.db_field, f)
+        self._forward_fields_map = forward_fields_map
 
         try:
             self.object_name = self.document.__name__
@@ -178,34 +192,46 @@ class DocumentMetaWrapper(object):
 
         Uses a cache internally, so after the first access, this is very fast.
         """
+        field_cache = self._field_cache
+        if field_cache is None:
+            field_cache = self._init_field_cache()
         try:
-            try:
-                return self._field_cache[name]
-            except TypeError:
-                self._init_field_cache()
-                return self._field_cache[name]
+            return field_cache[name]
         except KeyError:
             raise FieldDoesNotExist('%s has no field named %r'
                     % (self.object_name, name))
 
     def _init_field_cache(self):
-        if self._field_cache is None:
-            self._field_cache = {}
-
-        for f in self.document._fields.values():
+        """
+        Indexes the fields by name, attname and db_field, and the
+        ReferenceFields also by the model name of the referenced document,
+        the way django indexes relations. Built on first use rather than with
+        the class, so that the referenced documents are registered.
+        """
+        cache = dict((name, (f, None, True, False))
+                     for name, f in self._forward_fields_map.items())
+        complete = True
+        for f in self.fields:
             if isinstance(f, ReferenceField):
-                document = f.document_type
-                self._field_cache[document._meta.module_name] = (f, document, False, False)
-            else:
-                self._field_cache[f.name] = (f, None, True, False)
-
-        return self._field_cache
+                try:
+                    document = f.document_type
+                except NotRegistered:
+                    complete = False
+                    continue
+                cache.setdefault(document.__name__.lower(),
+                                 (f, document, False, False))
+        if complete:
+            self._field_cache = cache
+        return cache
 
     def get_field(self, name, many_to_many=True):
         """
         Returns the requested field by name. Raises FieldDoesNotExist on error.
         """
-        return self.get_field_by_name(name)[0]
+        try:
+            return self._forward_fields_map[name]
+        except KeyError:
+            return self.get_field_by_name(name)[0]
 
     def __getattr__(self, name):
         try:
@@ -214,10 +240,10 @@ class DocumentMetaWrapper(object):
             raise AttributeError(*e.args)
 
     def __setattr__(self, name, value):
-        if not hasattr(self, name):
-            self._meta[name] = value
-        else:
+        if name in self.__slots__:
             super(DocumentMetaWrapper, self).__setattr__(name, value)
+        else:
+            self._meta[name] = value
 
     def __getitem__(self, key):
         return self._meta[key]
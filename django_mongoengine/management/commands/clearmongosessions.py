@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from django_mongoengine.sessions import MongoSession, SessionStore
+from django_mongoengine.utils import datetime_now
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes the expired MongoDB sessions in batches and reports how "
+        "many were deleted and how fast. Can be run as a cronjob."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Number of sessions deleted per batch (default: 1000).")
+        parser.add_argument(
+            '--count', action='store_true', default=False,
+            help="Only report the number of sessions, don't delete any.")
+
+    def handle(self, **options):
+        collection = MongoSession._get_collection()
+        total = collection.count()
+        expired = collection.find(
+            {'expire_date': {'$lt': datetime_now()}}).count()
+        self.stdout.write("%d sessions, %d expired" % (total, expired))
+        if options['count']:
+            return
+
+        start = time.time()
+        deleted = SessionStore.clear_expired(batch_size=options['batch_size'])
+        elapsed = time.time() - start
+        self.stdout.write("Deleted %d expired sessions in %.2fs (%d/s)" % (
+            deleted, elapsed, deleted / elapsed if elapsed else deleted))
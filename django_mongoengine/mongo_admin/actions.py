@@ -2,17 +2,17 @@
 Built-in, globally-available admin actions.
 """
 
-from django import template
 from django.core.exceptions import PermissionDenied
 from django.contrib.admin import helpers
-from django.contrib.admin.utils import get_deleted_objects, model_ngettext
-from django.db import router
-from django.shortcuts import render_to_response
+from django.contrib.admin.utils import model_ngettext
+from django.template.response import TemplateResponse
+from django.utils.text import capfirst
 from django.utils.translation import ugettext_lazy, ugettext as _
 from django.db import models
 
 from django.contrib.admin.actions import delete_selected as django_delete_selected
 
+from django_mongoengine.mongo_admin.util import str_queryset
 from django_mongoengine.utils import force_text
 
 
@@ -26,11 +26,12 @@ def _delete_selected(modeladmin, request, queryset):
     """
     Default action which deletes the selected objects.
 
-    This action first displays a confirmation page whichs shows all the
-    deleteable objects, or, if the user has no permission one of the related
-    childs (foreignkeys), a "permission denied" message.
+    This action first displays a confirmation page which shows all the
+    deleteable objects. Documents have no related objects deleted along with
+    them, so this is only the selected documents.
 
-    Next, it delets all selected objects and redirects back to the change list.
+    Next, it deletes all selected objects in batches and redirects back to
+    the change list.
     """
     opts = modeladmin.model._meta
     app_label = opts.app_label
@@ -39,67 +40,49 @@ def _delete_selected(modeladmin, request, queryset):
     if not modeladmin.has_delete_permission(request):
         raise PermissionDenied
 
-    using = router.db_for_write(modeladmin.model)
-
-    # Populate deletable_objects, a data structure of all related objects that
-    # will also be deleted.
-    # TODO: Permissions would be so cool...
-    deletable_objects, perms_needed, protected = get_deleted_objects(
-        queryset, opts, request.user, modeladmin.admin_site, using)
-
     # The user has already confirmed the deletion.
     # Do the deletion and return a None to display the change list view again.
     if request.POST.get('post'):
-        if perms_needed:
-            raise PermissionDenied
-        n = len(queryset)
+        n = modeladmin.delete_queryset(request, queryset)
         if n:
-            for obj in queryset:
-                obj_display = force_text(obj)
-                modeladmin.log_deletion(request, obj, obj_display)
-                # call the objects delete method to ensure signals are
-                # processed.
-                obj.delete()
-            # This is what you get if you have to monkey patch every object in a changelist
-            # No queryset object, I can tell ya. So we get a new one and delete that. 
-            #pk_list = [o.pk for o in queryset]
-            #klass = queryset[0].__class__
-            #qs = klass.objects.filter(pk__in=pk_list)
-            #qs.delete()
             modeladmin.message_user(request, _("Successfully deleted %(count)d %(items)s.") % {
                 "count": n, "items": model_ngettext(modeladmin.opts, n)
             })
         # Return None to display the change list page again.
         return None
 
-    if len(queryset) == 1:
+    deletable_objects = [
+        "%s: %s" % (capfirst(opts.verbose_name), force_text(obj))
+        for obj in str_queryset(queryset)
+    ]
+
+    n = len(deletable_objects)
+    if n == 1:
         objects_name = force_text(opts.verbose_name)
     else:
         objects_name = force_text(opts.verbose_name_plural)
 
-    if perms_needed or protected:
-        title = _("Cannot delete %(name)s") % {"name": objects_name}
-    else:
-        title = _("Are you sure?")
-
-    context = {
-        "title": title,
-        "objects_name": objects_name,
-        "deletable_objects": [deletable_objects],
-        'queryset': queryset,
-        "perms_lacking": perms_needed,
-        "protected": protected,
-        "opts": opts,
-        "root_path": modeladmin.admin_site.root_path,
-        "app_label": app_label,
-        'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
-    }
-    
+    context = dict(
+        modeladmin.admin_site.each_context(request),
+        title=_("Are you sure?"),
+        objects_name=objects_name,
+        deletable_objects=[deletable_objects],
+        model_count=[(force_text(opts.verbose_name_plural), n)],
+        # only the ids are posted back
+        queryset=queryset.only(opts.pk_name).no_cache(),
+        perms_lacking=set(),
+        protected=[],
+        opts=opts,
+        action_checkbox_name=helpers.ACTION_CHECKBOX_NAME,
+    )
+
+    request.current_app = modeladmin.admin_site.name
+
     # Display the confirmation page
-    return render_to_response(modeladmin.delete_selected_confirmation_template or [
-        "admin/%s/%s/delete_selected_confirmation.html" % (app_label, opts.object_name.lower()),
+    return TemplateResponse(request, modeladmin.delete_selected_confirmation_template or [
+        "admin/%s/%s/delete_selected_confirmation.html" % (app_label, opts.model_name),
         "admin/%s/delete_selected_confirmation.html" % app_label,
         "admin/delete_selected_confirmation.html"
-    ], context, context_instance=template.RequestContext(request))
+    ], context)
 
 delete_selected.short_description = ugettext_lazy("Delete selected %(verbose_name_plural)s")
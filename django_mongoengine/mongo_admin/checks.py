@@ -0,0 +1,70 @@
+from django.contrib.admin.checks import ModelAdminChecks, must_be
+from django.core import checks
+from mongoengine.errors import LookUpError
+
+
+class DocumentAdminChecks(ModelAdminChecks):
+
+    def check(self, admin_obj, model=None, **kwargs):
+        if model is None:
+            errors = super(DocumentAdminChecks, self).check(admin_obj, **kwargs)
+            model = admin_obj.model
+        else:
+            # Django 1.8 checks the admin class, given the model
+            errors = super(DocumentAdminChecks, self).check(
+                admin_obj, model, **kwargs)
+        errors.extend(self._check_search_mode(admin_obj, model))
+        return errors
+
+    def _check_search_mode(self, obj, model):
+        """
+        Check search_mode is 'regex' or 'text', and that the collection has
+        the indexes a text search_mode relies on.
+        """
+        if obj.search_mode not in ('regex', 'text'):
+            return must_be("'regex' or 'text'", option='search_mode', obj=obj,
+                           id='mongo_admin.E001')
+        if obj.search_mode != 'text':
+            return []
+
+        text_fields = set()
+        # the fields an index can be sought on, with or without _cls
+        first_fields = set(['_id'])
+        for spec in model._meta.get('index_specs') or []:
+            keys = [(key, direction) for key, direction in spec['fields']
+                    if key != '_cls']
+            text_fields.update(key for key, direction in keys
+                               if direction == 'text')
+            if keys and keys[0][1] != 'text':
+                first_fields.add(keys[0][0])
+
+        admin_cls = obj if isinstance(obj, type) else obj.__class__
+        errors = []
+        for search_field in obj.search_fields:
+            search_field = str(search_field)
+            name = search_field.lstrip('^=')
+            try:
+                db_name = model._translate_field_name(name.replace('__', '.'))
+            except LookUpError:
+                db_name = name
+            if search_field[0] in '^=':
+                if db_name not in first_fields:
+                    errors.append(checks.Warning(
+                        "'%s' in 'search_fields' is not the first field of "
+                        "an index of %s, searching it scans the collection."
+                        % (name, model._meta.object_name),
+                        hint="Add an index on '%s'." % name,
+                        obj=admin_cls,
+                        id='mongo_admin.W001',
+                    ))
+            elif db_name not in text_fields:
+                errors.append(checks.Warning(
+                    "'%s' in 'search_fields' is not in a text index of %s, "
+                    "the text search fails or ignores it."
+                    % (name, model._meta.object_name),
+                    hint="Add '$%s' to the text index of the document's "
+                         "'indexes'." % name,
+                    obj=admin_cls,
+                    id='mongo_admin.W002',
+                ))
+        return errors
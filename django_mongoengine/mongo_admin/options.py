@@ -6,6 +6,7 @@ from django.contrib.admin import widgets, helpers
 from django.contrib.admin.utils import (
     unquote, flatten_fieldsets, get_deleted_objects,
 )
+from django.contrib.admin import options as djmod
 from django.contrib.admin.options import (
     TO_FIELD_VAR, IS_POPUP_VAR,
     get_ul_class, csrf_protect_m,
@@ -30,10 +31,12 @@ from django_mongoengine.utils import force_text
 from django_mongoengine.fields import (ListField, EmbeddedDocumentField,
                                        ReferenceField, StringField)
 
-from django_mongoengine.mongo_admin.util import RelationWrapper
+from django_mongoengine.mongo_admin.checks import DocumentAdminChecks
+from django_mongoengine.mongo_admin.util import RelationWrapper, str_queryset
+from django_mongoengine.mongo_admin.views import DocumentChangeList
 
 from django_mongoengine.utils.wrappers import copy_class
-from django_mongoengine.utils.monkey import get_patched_django_module
+from django_mongoengine.utils.monkey import patch_globals
 from django_mongoengine.forms.documents import (
     DocumentForm,
     inlineformset_factory, BaseInlineDocumentFormSet)
@@ -43,11 +46,8 @@ def get_content_type_for_model(obj):
     return apps.get_model("contenttypes.ContentType")()
 
 
-djmod = get_patched_django_module(
-    "django.contrib.admin.options",
-    get_content_type_for_model=get_content_type_for_model,
-)
-
+@patch_globals(djmod.BaseModelAdmin,
+               get_content_type_for_model=get_content_type_for_model)
 class BaseDocumentAdmin(djmod.BaseModelAdmin):
     """Functionality common to both ModelAdmin and InlineAdmin."""
     form = DocumentForm
@@ -150,9 +150,20 @@ class BaseDocumentAdmin(djmod.BaseModelAdmin):
 
 
 @copy_class(djmod.ModelAdmin)
+@patch_globals(djmod.ModelAdmin,
+               get_content_type_for_model=get_content_type_for_model)
 class DocumentAdmin(BaseDocumentAdmin):
     "Encapsulates all admin options and functionality for a given model."
 
+    # Count the changelist from the collection metadata and stop counting
+    # filtered results at count_limit, for collections too big to count.
+    approximate_count = False
+    count_limit = 1000
+    change_list_template = "admin/change_document_list.html"
+    # 'regex' searches like django does, 'text' through the indexes: see
+    # DocumentChangeList.get_text_search_queryset.
+    search_mode = 'regex'
+    checks_class = DocumentAdminChecks
 
     def __init__(self, model, admin_site):
         self.model = model
@@ -200,6 +211,12 @@ class DocumentAdmin(BaseDocumentAdmin):
                 self.exclude.append(f.name)
             self.inline_instances.append(inline_instance)
 
+    def get_changelist(self, request, **kwargs):
+        """
+        Returns the ChangeList class for use on the changelist page.
+        """
+        return DocumentChangeList
+
     def get_changelist_form(self, request, **kwargs):
         kwargs.setdefault("form", DocumentForm)
         return super(DocumentAdmin, self).get_changelist_form(request, **kwargs)
@@ -242,6 +259,57 @@ class DocumentAdmin(BaseDocumentAdmin):
             return
         super(DocumentAdmin, self).log_deletion(request, object, object_repr)
 
+    def log_deletions(self, request, objects):
+        """
+        Log that the given objects will be deleted, with a single query.
+        Note that this method is called before the deletion.
+
+        The default implementation creates admin LogEntry objects.
+        """
+        if not self.log:
+            return
+        from django.contrib.admin.models import LogEntry, DELETION
+        LogEntry.objects.bulk_create([LogEntry(
+            user_id=request.user.pk,
+            content_type_id=get_content_type_for_model(obj).pk,
+            object_id=force_text(obj.pk),
+            object_repr=force_text(obj)[:200],
+            action_flag=DELETION,
+        ) for obj in objects])
+
+    def delete_queryset(self, request, queryset, batch_size=1000):
+        """
+        Deletes the documents of the queryset, with one ``_id $in`` delete
+        per batch of ``batch_size`` documents, and returns how many were
+        deleted. Only their ids are read, along with the fields their string
+        is made of when their deletion is logged (see ``str_queryset``).
+        They are streamed, not kept in the queryset's result cache.
+
+        Documents are deleted one by one, sending their signals, only when
+        pre_delete or post_delete receivers are connected to the document.
+        """
+        if not self.log:
+            documents = queryset.clone().no_cache().scalar('pk')
+        else:
+            documents = str_queryset(queryset)
+
+        deleted = 0
+        batch = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) == batch_size:
+                deleted += self._delete_batch(request, queryset, batch)
+                batch = []
+        if batch:
+            deleted += self._delete_batch(request, queryset, batch)
+        return deleted
+
+    def _delete_batch(self, request, queryset, batch):
+        if self.log:
+            self.log_deletions(request, batch)
+            batch = [obj.pk for obj in batch]
+        return queryset.filter(pk__in=batch).delete() or 0
+
     @csrf_protect_m
     def changeform_view(self, request, object_id=None, form_url='', extra_context=None):
 
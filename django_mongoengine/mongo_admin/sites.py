@@ -4,13 +4,18 @@ from mongoengine.base import TopLevelDocumentMetaclass
 
 from django_mongoengine.mongo_admin.options import DocumentAdmin
 from django_mongoengine.forms.document_options import DocumentMetaWrapper
-#from django_mongoengine.mongo_admin import actions
+from django_mongoengine.mongo_admin import actions
 
 system_check_errors = []
 
 class AdminSite(sites.AdminSite):
     index_template = "mongo_admin/index.html"
 
+    def __init__(self, name='admin'):
+        super(AdminSite, self).__init__(name)
+        self._actions['delete_selected'] = actions.delete_selected
+        self._global_actions = self._actions.copy()
+
     def register(self, model_or_iterable, admin_class=None, **options):
 
         if isinstance(model_or_iterable, TopLevelDocumentMetaclass) and not admin_class:
@@ -1,10 +1,12 @@
 from django.template import Library
 
 from django.contrib.admin.templatetags.admin_list import (result_hidden_fields, ResultList, items_for_result,
-                                                          result_headers)
+                                                          result_headers, pagination)
+from django.contrib.admin.views.main import ALL_VAR
 from django.db.models.fields import FieldDoesNotExist
 
 from django_mongoengine.forms.utils import patch_document
+from django_mongoengine.mongo_admin.views import CURSOR_VAR
 
 register = Library()
 
@@ -20,7 +22,7 @@ def serializable_value(self, field_name):
     and not use this method.
     """
     try:
-        field = self._meta.get_field_by_name(field_name)[0]
+        field = self._meta.get_field(field_name)
     except FieldDoesNotExist:
         return getattr(self, field_name)
     return getattr(self, field.name)
@@ -58,3 +60,23 @@ def document_result_list(cl):
             'num_sorted_fields': num_sorted_fields,
             'results': list(results(cl))}
 result_list = register.inclusion_tag("admin/change_list_results.html")(document_result_list)
+
+def document_pagination(cl):
+    """
+    Just like the pagination from Django, with previous and next links
+    instead of page numbers for the pages of a KeysetPaginator.
+    """
+    page = getattr(cl, 'cursor_page', None)
+    if page is None:
+        return pagination(cl)
+    need_show_all_link = cl.can_show_all and not cl.show_all and cl.multi_page
+    return {
+        'cl': cl,
+        'pagination_required': False,
+        'show_all_url': need_show_all_link and cl.get_query_string({ALL_VAR: ''}),
+        'previous_url': page.has_previous() and cl.get_query_string(
+            {CURSOR_VAR: page.previous_cursor}),
+        'next_url': page.has_next() and cl.get_query_string(
+            {CURSOR_VAR: page.next_cursor}),
+    }
+register.inclusion_tag("admin/document_pagination.html")(document_pagination)
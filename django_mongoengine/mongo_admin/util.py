@@ -4,6 +4,7 @@ from django.db.models.fields import FieldDoesNotExist
 from django.utils import formats
 
 from mongoengine import fields
+from mongoengine.base import BaseDocument
 
 from django_mongoengine.utils import force_text
 
@@ -20,7 +21,7 @@ class RelationWrapper(object):
 def label_for_field(name, model, model_admin=None, return_attr=False):
     attr = None
     try:
-        field = model._meta.get_field_by_name(name)[0]
+        field = model._meta.get_field(name)
         label = field.name.replace('_', ' ')
     except FieldDoesNotExist:
         if name == "__unicode__":
@@ -55,6 +56,34 @@ def label_for_field(name, model, model_admin=None, return_attr=False):
         return label
 
 
+def str_fields(model):
+    """
+    Returns the names of the fields the string of a ``model`` document is
+    made of, declared with an ``admin_only_fields`` attribute on its
+    ``__unicode__`` or ``__str__``, or None when they aren't known.
+    """
+    method = getattr(model, '__unicode__', None)
+    if method is None:
+        method = model.__str__
+        if method == BaseDocument.__str__:
+            # "<Document> object"
+            return ()
+    return getattr(method, 'admin_only_fields', None)
+
+
+def str_queryset(queryset):
+    """
+    Returns a non-caching copy of ``queryset`` which only loads the primary
+    key of the documents and the fields their string is made of, or whole
+    documents when these aren't known (see ``str_fields``).
+    """
+    document = queryset._document
+    fields = str_fields(document)
+    if fields is not None:
+        queryset = queryset.only(document._meta['id_field'], *fields)
+    return queryset.clone().no_cache()
+
+
 def display_for_field(value, field):
     from django.contrib.admin.templatetags.admin_list import _boolean_icon
     from django.contrib.admin.views.main import EMPTY_CHANGELIST_VALUE
@@ -79,7 +108,7 @@ def display_for_field(value, field):
 
 def help_text_for_field(name, model):
     try:
-        help_text = model._meta.get_field_by_name(name)[0].help_text
+        help_text = model._meta.get_field(name).help_text
     except FieldDoesNotExist:
         help_text = ""
     return smart_text(help_text, strings_only=True)
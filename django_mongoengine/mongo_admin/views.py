@@ -1,4 +1,5 @@
 import operator
+from functools import reduce
 
 from django.core.exceptions import SuspiciousOperation, ImproperlyConfigured
 from django.contrib.admin.views.main import (
@@ -6,9 +7,27 @@ from django.contrib.admin.views.main import (
     TO_FIELD_VAR)
 from django.contrib.admin.options import IncorrectLookupParameters
 from django.core.paginator import InvalidPage
+from django.utils import six
 from django.utils.encoding import smart_str
 
 from mongoengine import Q
+from mongoengine.fields import ListField, ReferenceField
+
+from django_mongoengine.mongo_admin.util import str_fields
+from django_mongoengine.paginator import KeysetPaginator
+
+# Changelist variable holding the cursor of a KeysetPaginator page
+CURSOR_VAR = 'cursor'
+
+
+class CappedCount(int):
+    """
+    A count which stopped at its value, rendered as ``"1000+"``.
+    """
+    def __str__(self):
+        return "%d+" % self
+
+    __unicode__ = __str__
 
 
 class DocumentChangeList(ChangeList):
@@ -28,28 +47,68 @@ class DocumentChangeList(ChangeList):
                 date_hierarchy, search_fields, list_select_related,
                 list_per_page, list_editable, model_admin)
         self.pk_attname = self.lookup_opts.pk_name
+        # A cursor is only valid for the filters and ordering it was made
+        # with, so the links of the page don't carry it along.
+        self.params.pop(CURSOR_VAR, None)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super(DocumentChangeList, self).get_filters_params(
+            params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
 
     def get_results(self, request):
-        paginator = self.model_admin.get_paginator(request, self.query_set,
+        queryset = self.queryset
+        # The documents of list_editable forms are saved, so they are loaded
+        # whole when the forms are posted.
+        if not (self.list_editable and request.method == 'POST'):
+            only_fields = self.get_only_fields()
+            if only_fields is not None:
+                queryset = queryset.only(*only_fields)
+        paginator = self.model_admin.get_paginator(request, queryset,
                                                    self.list_per_page)
+        filtered = bool(self.get_filters_params() or
+                        self.params.get(SEARCH_VAR))
+        approximate = getattr(self.model_admin, 'approximate_count', False)
         # Get the number of objects, with admin filters applied.
-        result_count = paginator.count
+        if approximate:
+            # Count far enough for the requested page to exist.
+            limit = max(self.model_admin.count_limit,
+                        (self.page_num + 2) * self.list_per_page)
+            result_count = self.get_count(self.queryset, limit)
+            paginator._count = result_count
+        else:
+            result_count = paginator.count
 
         # Get the total number of objects, with no admin filters applied.
-        # Perform a slight optimization: Check to see whether any filters were
-        # given. If not, use paginator.hits to calculate the number of objects,
-        # because we've already done paginator.hits and the value is cached.
-        if len(self.query_set._query) == 1:
+        # Perform a slight optimization: when no filters were given the total
+        # is paginator.count, which has already been computed.
+        show_full_result_count = getattr(
+            self.model_admin, 'show_full_result_count', True)
+        if not show_full_result_count:
+            full_result_count = None
+        elif not filtered:
             full_result_count = result_count
+        elif approximate:
+            full_result_count = self.get_count(
+                self.root_queryset, self.model_admin.count_limit)
         else:
-            full_result_count = self.root_query_set.count()
+            full_result_count = self.root_queryset.count()
 
-        can_show_all = result_count <= self.list_max_show_all
+        can_show_all = (result_count <= self.list_max_show_all and
+                        not isinstance(result_count, CappedCount))
         multi_page = result_count > self.list_per_page
 
         # Get the list of objects to display on this page.
+        cursor_page = None
         if (self.show_all and can_show_all) or not multi_page:
-            result_list = self.query_set.clone()
+            result_list = queryset.clone()
+        elif isinstance(paginator, KeysetPaginator):
+            try:
+                cursor_page = paginator.page(request.GET.get(CURSOR_VAR))
+            except InvalidPage:
+                raise IncorrectLookupParameters
+            result_list = cursor_page.object_list
         else:
             try:
                 result_list = paginator.page(self.page_num+1).object_list
@@ -57,11 +116,97 @@ class DocumentChangeList(ChangeList):
                 raise IncorrectLookupParameters
 
         self.result_count = result_count
+        self.show_full_result_count = show_full_result_count
+        # Admin actions are shown if there is at least one entry or if
+        # entries are not counted.
+        self.show_admin_actions = (not show_full_result_count or
+                                   bool(full_result_count))
         self.full_result_count = full_result_count
         self.result_list = result_list
         self.can_show_all = can_show_all
         self.multi_page = multi_page
         self.paginator = paginator
+        self.cursor_page = cursor_page
+
+    def get_only_fields(self):
+        """
+        Returns the names of the fields the change list displays, which are
+        the only ones loaded for its rows, or None to load whole documents
+        when a column doesn't tell which fields it reads.
+
+        Callables, admin methods and document methods or properties of
+        ``list_display`` tell it with an ``admin_only_fields`` attribute::
+
+            def full_name(self, obj):
+                return "%s %s" % (obj.first_name, obj.last_name)
+            full_name.admin_only_fields = ('first_name', 'last_name')
+        """
+        only_fields = []
+        names = list(self.list_display)
+        names.extend(self.list_display_links or ())
+        names.extend(self.list_editable)
+        if self.list_select_related not in (True, False):
+            names.extend(self.list_select_related)
+        for name in names:
+            fields = self.get_display_fields(name)
+            if fields is None:
+                return None
+            only_fields.extend(fields)
+
+        # The keyset cursors of the page are read from its documents.
+        reverse_map = self.model._reverse_db_field_map
+        for key, direction in self.queryset._ordering or []:
+            if direction in (1, -1):
+                key = key.split('.')[0]
+                only_fields.append(reverse_map.get(key, key))
+        if getattr(self, 'to_field', None):
+            only_fields.append(self.to_field)
+        only_fields.append(self.lookup_opts.pk_name)
+
+        unique_fields = []
+        for name in only_fields:
+            if name not in unique_fields:
+                unique_fields.append(name)
+        return unique_fields
+
+    def get_display_fields(self, name):
+        """
+        Returns the names of the fields the ``list_display`` column ``name``
+        reads, or None when they aren't known, looking the column up like the
+        admin does when displaying it.
+        """
+        if name == 'action_checkbox':
+            # it only reads the primary key
+            return ()
+        if name in ('__str__', '__unicode__'):
+            return str_fields(self.model)
+        if callable(name):
+            attr = name
+        elif hasattr(self.model_admin, name):
+            attr = getattr(self.model_admin, name)
+        elif name in self.model._fields:
+            return (name,)
+        else:
+            attr = getattr(self.model, name, None)
+            if isinstance(attr, property):
+                attr = attr.fget
+        return getattr(attr, 'admin_only_fields', None)
+
+    def get_count(self, queryset, limit):
+        """
+        Counts the documents of ``queryset`` without scanning the collection:
+        an unfiltered queryset is answered from the collection metadata, any
+        other count stops after ``limit`` documents and is then returned as a
+        ``CappedCount``.
+        """
+        if not queryset._query and not queryset._none:
+            collection = queryset._collection
+            return getattr(collection, 'estimated_document_count',
+                           collection.count)()
+        count = queryset.limit(limit + 1).count(with_limit_and_skip=True)
+        if count > limit:
+            return CappedCount(limit)
+        return count
 
     def _get_default_ordering(self):
         try:
@@ -107,7 +252,7 @@ class DocumentChangeList(ChangeList):
 
         # Add the given query's ordering fields, if any.
         sign = lambda t: t[1] > 0 and '+' or '-'
-        qs_ordering = [sign(t) + t[0] for t in queryset._ordering]
+        qs_ordering = [sign(t) + t[0] for t in queryset._ordering or []]
         ordering.extend(qs_ordering)
 
         # Ensure that the primary key is systematically present in the list of
@@ -152,9 +297,9 @@ class DocumentChangeList(ChangeList):
                 )
         return lookup_params
 
-    def get_query_set(self, request=None):
+    def get_queryset(self, request=None):
         # First, we collect all the declared list filters.
-        qs = self.root_query_set.clone()
+        qs = self.root_queryset.clone()
 
         try:
             (self.filter_specs, self.has_filters, remaining_lookup_params,
@@ -187,6 +332,8 @@ class DocumentChangeList(ChangeList):
             # ValueError, ValidationError, or ?.   
             raise IncorrectLookupParameters(e)
 
+        qs = self.apply_select_related(qs)
+
         # Set ordering.
         ordering = self.get_ordering(request, qs)
         qs = qs.order_by(*ordering)
@@ -204,6 +351,8 @@ class DocumentChangeList(ChangeList):
                 return "%s__icontains" % field_name
 
         if self.search_fields and self.query:
+            if getattr(self.model_admin, 'search_mode', 'regex') == 'text':
+                return self.get_text_search_queryset(qs, ordering)
             orm_lookups = [construct_search(str(search_field))
                            for search_field in self.search_fields]
             for bit in self.query.split():
@@ -211,3 +360,68 @@ class DocumentChangeList(ChangeList):
                               for orm_lookup in orm_lookups]
                 qs = qs.filter(reduce(operator.or_, or_queries))
         return qs
+
+    def apply_select_related(self, qs):
+        """
+        Fetches the documents the rows reference with one query per
+        reference field, instead of one per row. By default the references
+        shown in ``list_display`` are followed.
+        """
+        if self.list_select_related is True:
+            return qs.select_related()
+        if self.list_select_related:
+            return qs.select_related(*self.list_select_related)
+        if self.list_select_related is False:
+            fields = self.get_related_fields_in_list_display()
+            if fields:
+                return qs.select_related(*fields)
+        return qs
+
+    def get_related_fields_in_list_display(self):
+        fields = []
+        for name in self.list_display:
+            field = self.model._fields.get(name) if isinstance(
+                name, six.string_types) else None
+            if isinstance(field, ListField):
+                field = field.field
+            if isinstance(field, ReferenceField):
+                fields.append(name)
+        return fields
+
+    def get_text_search_queryset(self, qs, ordering):
+        """
+        Applies the keyword search with lookups indexes can answer: search
+        fields starting with ``^`` are matched with anchored, case-sensitive
+        regexes and ``=`` ones by equality, the others through the collection's
+        text index. Unless a column was picked, the text search results are
+        ordered by relevance.
+        """
+        lookups = []
+        text_search = False
+        for search_field in self.search_fields:
+            search_field = str(search_field)
+            if search_field.startswith('^'):
+                lookups.append("%s__startswith" % search_field[1:])
+            elif search_field.startswith('='):
+                lookups.append(search_field[1:])
+            else:
+                text_search = True
+
+        query = None
+        if lookups:
+            query = reduce(operator.and_, [
+                reduce(operator.or_, [Q(**{lookup: bit}) for lookup in lookups])
+                for bit in self.query.split()
+            ])
+        if not text_search:
+            return qs.filter(query)
+        if query is not None:
+            # $text may be one of the $or clauses when all of them are indexed
+            return qs.filter(__raw__={'$or': [
+                {'$text': {'$search': self.query}},
+                query.to_query(self.model),
+            ]})
+        qs = qs.search_text(self.query)
+        if ORDER_VAR not in self.params:
+            qs = qs.order_by('$text_score', *ordering)
+        return qs
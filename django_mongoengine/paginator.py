@@ -0,0 +1,169 @@
+"""
+Keyset ("seek") pagination for querysets.
+
+Django's ``Paginator`` slices the queryset, which MongoDB answers by
+skipping every document before the page: the deeper the page, the slower.
+``KeysetPaginator`` instead looks a page up from the ordering values of the
+document next to it, with a range query an index on the ordering fields
+answers without skipping anything. Pages are addressed by opaque cursors
+instead of numbers::
+
+    paginator = KeysetPaginator(Post.objects.order_by('-published'), 20)
+    page = paginator.page(request.GET.get('cursor'))
+    page.next_cursor, page.previous_cursor
+"""
+import base64
+
+from bson import json_util
+from django.core.paginator import EmptyPage, InvalidPage
+
+
+class KeysetPaginator(object):
+    """
+    Paginates a queryset on its ordering, made total by adding ``_id`` to
+    it. The ordering fields should be set on every document: documents
+    missing one are skipped by the range queries.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True):
+        # orphans can't be known without counting, they are ignored.
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.allow_empty_first_page = allow_empty_first_page
+        self._count = None
+
+        ordering = object_list._ordering
+        if ordering is None:
+            ordering = object_list._get_order_by(
+                object_list._document._meta['ordering'] or [])
+        # relevance can't be sought, it's left out
+        ordering = [(key, direction) for key, direction in ordering
+                    if direction in (1, -1)]
+        if '_id' not in [key for key, direction in ordering]:
+            ordering.append(('_id', 1))
+        self.ordering = ordering
+
+    def _get_count(self):
+        """
+        Returns the total number of objects, across all pages.
+        """
+        if self._count is None:
+            self._count = self.object_list.count()
+        return self._count
+    count = property(_get_count)
+
+    def page(self, cursor=None):
+        """
+        Returns the page following the given cursor, or preceding it for a
+        previous page cursor. Without a cursor, returns the first page.
+        """
+        if cursor:
+            backwards, values = self.decode_cursor(cursor)
+        else:
+            backwards, values = False, None
+
+        ordering = self.ordering
+        if backwards:
+            ordering = [(key, -direction) for key, direction in ordering]
+        queryset = self.object_list.clone()
+        queryset._ordering = ordering
+        if values is not None:
+            queryset = queryset.filter(__raw__=self.seek_query(ordering,
+                                                               values))
+
+        object_list = list(queryset.limit(self.per_page + 1))
+        has_more = len(object_list) > self.per_page
+        del object_list[self.per_page:]
+        if not object_list and (values is not None or
+                                not self.allow_empty_first_page):
+            raise EmptyPage('That page contains no results')
+
+        if backwards:
+            object_list.reverse()
+            return KeysetPage(object_list, self, has_next=True,
+                              has_previous=has_more)
+        return KeysetPage(object_list, self, has_next=has_more,
+                          has_previous=values is not None)
+
+    def seek_query(self, ordering, values):
+        """
+        Returns the raw query matching the documents which come after the
+        given ordering values: ``a > x or (a == x and _id > y)``.
+        """
+        clauses = []
+        for i, (key, direction) in enumerate(ordering):
+            clause = dict((k, value) for (k, d), value
+                          in zip(ordering[:i], values[:i]))
+            clause[key] = {'$gt' if direction > 0 else '$lt': values[i]}
+            clauses.append(clause)
+        return {'$or': clauses}
+
+    def cursor(self, document, backwards=False):
+        """
+        Returns the cursor of the page after ``document``, or before it
+        when ``backwards`` is set.
+        """
+        values = []
+        son = document.to_mongo()
+        for key, direction in self.ordering:
+            value = son
+            for part in key.split('.'):
+                value = value.get(part) if hasattr(value, 'get') else None
+            values.append(value)
+        data = json_util.dumps([int(backwards), values])
+        cursor = base64.urlsafe_b64encode(data.encode('utf-8'))
+        return cursor.decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """
+        Returns the ``(backwards, values)`` encoded in ``cursor``.
+        """
+        try:
+            cursor = str(cursor)
+            data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            backwards, values = json_util.loads(data.decode('utf-8'))
+        except (TypeError, ValueError, UnicodeError):
+            raise InvalidPage('That cursor is not valid')
+        if (not isinstance(values, list) or
+                len(values) != len(self.ordering) or
+                any(isinstance(value, dict) for value in values)):
+            raise InvalidPage('That cursor is not valid')
+        return bool(backwards), values
+
+
+class KeysetPage(object):
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<Page of %s objects>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return self.paginator.cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous():
+            return self.paginator.cursor(self.object_list[0], backwards=True)
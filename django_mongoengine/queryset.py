@@ -1,24 +1,180 @@
-import sys
-
+from django.db.models.aggregates import Aggregate
+from django.db.models.constants import LOOKUP_SEP
 from django.utils import six
-from django.db.models.query import QuerySet as DjangoQuerySet
 
-from mongoengine.errors import NotUniqueError
-from mongoengine import queryset as qs
+from bson import DBRef, ObjectId, SON
+from pymongo.collection import ReturnDocument
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+
+from mongoengine.base import get_document
+from mongoengine.base.datastructures import BaseList
+from mongoengine.connection import DEFAULT_CONNECTION_NAME, get_db
+from mongoengine.errors import (NotUniqueError, OperationError,
+                                ValidationError)
+from mongoengine.fields import ListField, ReferenceField
+from mongoengine import queryset as qs, signals
+
+from .utils import OrderedDict
+from .utils.router import router
 
 class QueryWrapper(object):
     # XXX: copy funcs from django; now it's just wrapper
     select_related = False
     order_by = []
 
-    def __init__(self, q, ordering):
+    def __init__(self, q, ordering, select_related=False):
         self.q = q
         self.order_by = ordering or []
+        self.select_related = select_related
+
+
+def _reference_field(document, name):
+    """
+    Returns ``(field, many)`` for the ReferenceField, or ListField of
+    ReferenceFields, called ``name`` on ``document``.
+    """
+    field = document._fields.get(name)
+    if isinstance(field, ReferenceField):
+        return field, False
+    if isinstance(field, ListField) and isinstance(field.field, ReferenceField):
+        return field.field, True
+    raise ValueError(
+        "'%s' does not resolve to a ReferenceField on %s - this is an invalid "
+        "parameter to prefetch_related()." % (name, document.__name__))
+
+
+def _prefetch_field(documents, name):
+    """
+    Replaces the references stored in field ``name`` of every document by
+    the referenced documents, fetched with one query per document class.
+    Returns the documents that were attached.
+    """
+    wanted = {}
+    rows = []
+    for doc in documents:
+        field, many = _reference_field(type(doc), name)
+        value = doc._data.get(name)
+        values = list(value or []) if many else [value]
+        for v in values:
+            if isinstance(v, DBRef):
+                cls = get_document(v.cls) if hasattr(v, 'cls') else field.document_type
+                wanted.setdefault(cls, set()).add(v.id)
+        rows.append((doc, field, many, values))
+
+    loaded = {}
+    for cls, ids in wanted.items():
+        for pk, obj in cls.objects.in_bulk(list(ids)).items():
+            loaded[cls, pk] = obj
+
+    related = []
+    for doc, field, many, values in rows:
+        objs = []
+        for v in values:
+            if isinstance(v, DBRef):
+                cls = get_document(v.cls) if hasattr(v, 'cls') else field.document_type
+                v = loaded.get((cls, v.id), v)
+            if v is not None and not isinstance(v, DBRef):
+                related.append(v)
+            objs.append(v)
+        if many:
+            objs = BaseList(objs, doc, name)
+            objs._dereferenced = True
+            doc._data[name] = objs
+        else:
+            doc._data[name] = objs[0]
+    return related
+
+
+def prefetch_related_objects(documents, *lookups):
+    """
+    Resolves the references named by ``lookups`` on ``documents`` in
+    batches: one ``$in`` query per lookup and referenced document class.
+    Lookups may span references, e.g. ``'author__publisher'``.
+    """
+    for lookup in lookups:
+        name, _, rest = lookup.partition('__')
+        related = _prefetch_field(documents, name)
+        if rest and related:
+            prefetch_related_objects(related, rest)
+
+_ACCUMULATORS = {
+    'SUM': '$sum',
+    'AVG': '$avg',
+    'MAX': '$max',
+    'MIN': '$min',
+    'STDDEV_POP': '$stdDevPop',
+    'STDDEV_SAMP': '$stdDevSamp',
+}
+
+
+def _compile_aggregate(queryset, alias, aggregate):
+    """
+    Translates a django aggregate into ``(accumulator, projection, empty)``:
+    the ``$group`` accumulator stored under ``alias``, the ``$project``
+    expression applied to it (or None) and the value of an empty queryset.
+    """
+    source = aggregate.get_source_expressions()[0]
+    name = getattr(source, 'name', None)
+    if name is not None:
+        name = name.replace(LOOKUP_SEP, '.')
+        path = '$' + queryset._fields_to_dbfields([name])[0]
+    if aggregate.function == 'COUNT':
+        distinct = (getattr(aggregate, 'distinct', False) or
+                    aggregate.extra.get('distinct'))
+        if name is None or path == '$_id':
+            return {'$sum': 1}, None, 0
+        if distinct:
+            return ({'$addToSet': path},
+                    {'$size': {'$setDifference': ['$' + alias, [None]]}},
+                    0)
+        return {'$sum': {'$cond': [{'$gt': [path, None]}, 1, 0]}}, None, 0
+    if name is None or aggregate.function not in _ACCUMULATORS:
+        raise NotImplementedError(
+            "%s is not supported by django_mongoengine." % aggregate.name)
+    return {_ACCUMULATORS[aggregate.function]: path}, None, None
+
+
+def _group_stages(group_by, annotations):
+    """
+    Returns the ``$group`` and ``$project`` stages computing ``annotations``
+    for each distinct value of the ``group_by`` db field paths. The output
+    rows have the same shape as the documents, plus one key per alias.
+    """
+    keys = SON(('f%d' % i, '$' + path) for i, path in enumerate(group_by))
+    group = {'_id': keys or None}
+    project = {'_id': 0}
+    for i, path in enumerate(group_by):
+        project[path] = '$_id.f%d' % i
+    for alias, accumulator, projection, empty in annotations:
+        group[alias] = accumulator
+        project[alias] = projection or 1
+    return [{'$group': group}, {'$project': project}]
+
+
+# mongoengine names the iterator method ``next`` on py2 and ``__next__`` on py3
+_document_next = getattr(qs.QuerySet, '__next__', None) or qs.QuerySet.next
+
 
 class QuerySet(qs.QuerySet):
     """
     A base queryset with django-required attributes
     """
+    # set by values()/values_list(): a list of (name, db path) pairs
+    _values_fields = None
+    _values_tuple = False
+    _values_flat = False
+    # set by prefetch_related()/select_related()
+    _prefetch_related_lookups = ()
+    # set by annotate(): the grouped db field paths and the compiled
+    # aggregates; results then come from an aggregation cursor
+    _group_by = None
+    _annotations = None
+    _aggregate_cursor = None
+    # set by using(); otherwise MONGODB_ROUTERS pick the alias, separately
+    # for reads and for the operations that set _for_write
+    _db = None
+    _for_write = False
 
     @property
     def model(self):
@@ -26,29 +182,373 @@ class QuerySet(qs.QuerySet):
 
     @property
     def query(self):
-        return QueryWrapper(self._query, self._ordering)
+        return QueryWrapper(self._query, self._ordering,
+                            bool(self._prefetch_related_lookups))
+
+    def prefetch_related(self, *lookups):
+        """
+        Returns a new QuerySet which resolves the given ReferenceFields and
+        ListFields of ReferenceFields in batches as the results are fetched,
+        instead of one query per document. ``prefetch_related(None)`` clears
+        the lookups.
+        """
+        queryset = self.clone()
+        if lookups == (None,):
+            queryset._prefetch_related_lookups = ()
+            return queryset
+        for lookup in lookups:
+            document = self._document
+            for name in lookup.split('__'):
+                document = _reference_field(document, name)[0].document_type
+        queryset._prefetch_related_lookups = (
+            self._prefetch_related_lookups + lookups)
+        return queryset
+
+    def select_related(self, *fields):
+        """
+        Django-style select_related(): same as prefetch_related() for the
+        given fields, or for all reference fields if none are given.
+        Called with an integer ``max_depth`` it dereferences eagerly, as
+        mongoengine does.
+        """
+        if fields and isinstance(fields[0], six.integer_types):
+            return super(QuerySet, self).select_related(*fields)
+        if not fields:
+            fields = []
+            for name in self._document._fields_ordered:
+                try:
+                    _reference_field(self._document, name)
+                except ValueError:
+                    continue
+                fields.append(name)
+        return self.prefetch_related(*fields)
+
+    def _populate_cache(self):
+        start = len(self._result_cache or ())
+        super(QuerySet, self)._populate_cache()
+        if self._prefetch_related_lookups and self._values_fields is None:
+            prefetch_related_objects(self._result_cache[start:],
+                                     *self._prefetch_related_lookups)
+
+
+    def iterator(self, chunk_size=None):
+        """
+        Returns an iterator over the results which does not fill the result
+        cache, so large querysets can be streamed with flat memory usage.
+
+        ``chunk_size`` is passed to the cursor as its ``batch_size``.
+        """
+        if self._none:
+            return iter([])
+        queryset = self.clone().no_cache()
+        queryset._cursor_obj = None
+        # _batch_size is not carried over by clone()
+        queryset._batch_size = chunk_size
+        if self._annotations is not None:
+            options = {'batchSize': chunk_size} if chunk_size else {}
+            rows = self._collection.aggregate(self._annotate_pipeline(),
+                                              **options)
+            return (self._get_values(row) for row in rows)
+        if self._values_fields is not None:
+            return (self._get_values(row) for row in queryset._cursor)
+        return iter(queryset)
+
+    def values(self, *fields):
+        """
+        Returns dicts instead of documents, built straight from the raw
+        mongo rows. Only the requested fields are fetched from the server.
+        """
+        return self._values(fields)
+
+    def values_list(self, *fields, **kwargs):
+        """
+        Returns tuples instead of documents, or single values if ``flat`` is
+        True. Like values(), no document is built.
+        """
+        flat = kwargs.pop('flat', False)
+        if kwargs:
+            raise TypeError('Unexpected keyword arguments to values_list: %s'
+                    % (list(kwargs),))
+        if flat and len(fields) > 1:
+            raise TypeError("'flat' is not valid when values_list is called "
+                            "with more than one field.")
+        queryset = self._values(fields)
+        queryset._values_tuple = True
+        queryset._values_flat = flat
+        return queryset
+
+    def _values(self, fields):
+        if fields:
+            names = [f.replace('__', '.') for f in fields]
+            queryset = self.only(*names)
+        else:
+            fields = names = self._document._fields_ordered
+            queryset = self.clone()
+        queryset._cursor_obj = None
+        paths = [tuple(p.split('.')) for p in self._fields_to_dbfields(names)]
+        queryset._values_fields = list(zip(fields, paths))
+        queryset._values_tuple = queryset._values_flat = False
+        return queryset
+
+    def _get_values(self, row):
+        values = []
+        for name, path in self._values_fields:
+            value = row
+            for part in path:
+                if not isinstance(value, dict):
+                    value = None
+                    break
+                value = value.get(part)
+            values.append(value)
+        if self._values_flat:
+            return values[0]
+        if self._values_tuple:
+            return tuple(values)
+        return dict(zip((name for name, path in self._values_fields), values))
+
+    def __next__(self):
+        if self._values_fields is None:
+            return _document_next(self)
+        if self._limit == 0 or self._none:
+            raise StopIteration
+        return self._get_values(next(self._cursor))
+    next = __next__
+
+    def __getitem__(self, key):
+        if self._annotations is not None:
+            return self._annotated_item(key)
+        if self._values_fields is not None and isinstance(key, six.integer_types):
+            return self._get_values(self.clone()._cursor[key])
+        return super(QuerySet, self).__getitem__(key)
+
+    def _aggregate_aliases(self, args, kwargs):
+        aggregates = OrderedDict()
+        for arg in args:
+            try:
+                aggregates[arg.default_alias] = arg
+            except (AttributeError, TypeError):
+                raise TypeError("Complex aggregates require an alias")
+        aggregates.update(kwargs)
+        return aggregates
+
+    def aggregate(self, *args, **kwargs):
+        """
+        Returns a dictionary containing the calculations (aggregation)
+        over the current queryset, computed on the server with a ``$group``
+        stage. Given pipeline stages instead of django aggregates, runs them
+        as mongoengine's aggregate() does.
+        """
+        if not any(isinstance(arg, Aggregate)
+                   for arg in list(args) + list(kwargs.values())):
+            return super(QuerySet, self).aggregate(*args, **kwargs)
+        annotations = [
+            (alias,) + _compile_aggregate(self, alias, aggregate)
+            for alias, aggregate in self._aggregate_aliases(args, kwargs).items()
+        ]
+        if self._none:
+            return dict((alias, empty)
+                        for alias, accumulator, projection, empty in annotations)
+        pipeline = []
+        if self._query:
+            pipeline.append({'$match': self._query})
+        if self._skip or self._limit is not None:
+            if self._ordering:
+                pipeline.append({'$sort': SON(self._ordering)})
+            if self._skip:
+                pipeline.append({'$skip': self._skip})
+            if self._limit is not None:
+                pipeline.append({'$limit': self._limit})
+        pipeline.extend(_group_stages([], annotations))
+        row = next(iter(self._collection.aggregate(pipeline)), {})
+        return dict((alias, row.get(alias, empty))
+                    for alias, accumulator, projection, empty in annotations)
+
+    def annotate(self, *args, **kwargs):
+        """
+        Groups a values() or values_list() queryset by its fields and adds
+        the given aggregates to every group, computed on the server.
+        """
+        if self._values_fields is None:
+            raise NotImplementedError(
+                "annotate() is only supported after values() or values_list().")
+        queryset = self.clone()
+        queryset._cursor_obj = None
+        if queryset._group_by is None:
+            queryset._group_by = [
+                '.'.join(path) for name, path in self._values_fields]
+        annotations = []
+        for alias, aggregate in self._aggregate_aliases(args, kwargs).items():
+            annotations.append((alias,) + _compile_aggregate(self, alias, aggregate))
+            queryset._values_fields = queryset._values_fields + [(alias, (alias,))]
+        queryset._annotations = (self._annotations or []) + annotations
+        return queryset
+
+    def _annotate_pipeline(self):
+        pipeline = []
+        if self._query:
+            pipeline.append({'$match': self._query})
+        pipeline.extend(_group_stages(self._group_by, self._annotations))
+        if self._ordering:
+            pipeline.append({'$sort': SON(self._ordering)})
+        if self._skip:
+            pipeline.append({'$skip': self._skip})
+        if self._limit is not None:
+            pipeline.append({'$limit': self._limit})
+        return pipeline
+
+    def _annotated_item(self, key):
+        queryset = self.clone()
+        if isinstance(key, slice):
+            start = key.start or 0
+            queryset._skip = (self._skip or 0) + start
+            if key.stop is not None:
+                queryset._limit = key.stop - start
+            return queryset
+        queryset._skip = (self._skip or 0) + key
+        queryset._limit = 1
+        for row in queryset.iterator():
+            return row
+        raise IndexError("list index out of range")
 
     @property
-    def _prefetch_related_lookups(self):
-        # Originally used in django for prefetch_related(), 
-        # see https://docs.djangoproject.com/en/1.9/ref/models/querysets/#prefetch-related
-        # returning empty list to presume that no query prefetch is required
-        return []
-    
-    def iterator(self):
-        return self
+    def _cursor(self):
+        if self._annotations is None:
+            return super(QuerySet, self)._cursor
+        if self._aggregate_cursor is None and self._none:
+            self._aggregate_cursor = iter([])
+        if self._aggregate_cursor is None:
+            self._aggregate_cursor = self._collection.aggregate(
+                self._annotate_pipeline())
+        return self._aggregate_cursor
+
+    def count(self, with_limit_and_skip=False):
+        if self._annotations is None:
+            return super(QuerySet, self).count(with_limit_and_skip)
+        if self._none:
+            return 0
+        pipeline = self._annotate_pipeline()
+        pipeline.append({'$group': {'_id': None, 'count': {'$sum': 1}}})
+        row = next(iter(self._collection.aggregate(pipeline)), {})
+        return row.get('count', 0)
+
+    @property
+    def _collection(self):
+        if self._db is not None or not router.routers:
+            return self._collection_obj
+        hints = {'queryset': self}
+        if self._for_write:
+            alias = router.db_for_write(self._document, **hints)
+            read_preference = None
+        else:
+            alias = router.db_for_read(self._document, **hints)
+            read_preference = router.read_preference(self._document, **hints)
+        collection = self._collection_obj
+        if alias is not None and alias != self._document._meta.get(
+                'db_alias', DEFAULT_CONNECTION_NAME):
+            collection = get_db(alias)[collection.name]
+        if read_preference is not None:
+            collection = collection.with_options(
+                read_preference=read_preference)
+        return collection
+
+    def using(self, alias):
+        queryset = super(QuerySet, self).using(alias)
+        queryset._db = alias
+        return queryset
+
+    def for_write(self):
+        """
+        Returns a copy of the queryset that reads where the routers send its
+        writes, e.g. to fetch a document that is about to be modified.
+        """
+        queryset = self.clone()
+        queryset._for_write = True
+        return queryset
+
+    def insert(self, *args, **kwargs):
+        return super(QuerySet, self.for_write()).insert(*args, **kwargs)
+
+    def update(self, *args, **kwargs):
+        return super(QuerySet, self.for_write()).update(*args, **kwargs)
+
+    def modify(self, *args, **kwargs):
+        return super(QuerySet, self.for_write()).modify(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return super(QuerySet, self.for_write()).delete(*args, **kwargs)
+
+    def clone_into(self, cls):
+        cls = super(QuerySet, self).clone_into(cls)
+        for prop in ('_values_fields', '_values_tuple', '_values_flat',
+                     '_prefetch_related_lookups', '_group_by', '_annotations',
+                     '_db', '_for_write'):
+            setattr(cls, prop, getattr(self, prop))
+        return cls
 
     def get_queryset(self):
         return self
 
-    def latest(self, field_name):
-        return self.order_by("-" + field_name).first()
+    def _earliest_or_latest(self, fields, kwargs, reverse):
+        only = kwargs.pop('only', None)
+        if kwargs:
+            raise TypeError('Unexpected keyword arguments: %s' % (list(kwargs),))
+        if not fields:
+            fields = self._document._meta.get('get_latest_by')
+            if isinstance(fields, six.string_types):
+                fields = [fields]
+        if not fields:
+            raise ValueError(
+                "earliest() and latest() require either fields as positional "
+                "arguments or 'get_latest_by' in the document's meta.")
+        ordering = []
+        for field in fields:
+            descending = field.startswith('-') != reverse
+            ordering.append(('-' if descending else '') + field.lstrip('-'))
+        queryset = self.order_by(*ordering).limit(1)
+        if only:
+            if isinstance(only, six.string_types):
+                only = [only]
+            queryset = queryset.only(*only)
+        queryset._cursor_obj = None
+        try:
+            return next(queryset)
+        except StopIteration:
+            raise self._document.DoesNotExist(
+                "%s matching query does not exist." % self._document._class_name)
 
-    def earliest(self, field_name):
-        return self.order_by(field_name).first()
+    def latest(self, *fields, **kwargs):
+        """
+        Returns the latest document by the given fields, or by the
+        ``get_latest_by`` meta option. Pass ``only`` to fetch only some fields,
+        which lets an index on the fields cover the lookup.
+        """
+        return self._earliest_or_latest(fields, kwargs, reverse=True)
+
+    def earliest(self, *fields, **kwargs):
+        """
+        Returns the earliest document, see latest().
+        """
+        return self._earliest_or_latest(fields, kwargs, reverse=False)
 
     def exists(self):
-        return bool(self)
+        """
+        Returns True if the QuerySet contains any results, False if not.
+
+        Reuses the result cache if it is already filled, otherwise asks the
+        server for at most one ``_id`` without building a document.
+        """
+        if self._result_cache:
+            return True
+        if self._result_cache is not None and not self._has_more:
+            return False
+        if self._none or self._limit == 0:
+            return False
+        queryset = self.order_by().only(self._document._meta['id_field'])
+        queryset = queryset.limit(1)
+        queryset._cursor_obj = None
+        for _ in queryset._cursor:
+            return True
+        return False
 
 
     def _clone(self):
@@ -67,27 +567,192 @@ class QuerySet(qs.QuerySet):
         else:
             return False
 
-    get_or_create = DjangoQuerySet.__dict__["get_or_create"]
+    def get_or_create(self, defaults=None, **kwargs):
+        """
+        Looks up an object with the given kwargs, creating one if necessary.
+        Returns a tuple of (object, created), where created is a boolean
+        specifying whether an object was created.
 
-    _extract_model_params = DjangoQuerySet.__dict__["_extract_model_params"]
+        Runs as a single atomic upsert when the document is missing; the
+        document is not saved through ``save()``, so no save signals are sent.
+        """
+        return self._upsert(kwargs, defaults or {}, update=False)
 
-    def _create_object_from_params(self, lookup, params):
+    def update_or_create(self, defaults=None, **kwargs):
         """
-        Tries to create an object using passed params.
-        Used by get_or_create and update_or_create
+        Looks up an object with the given kwargs, updating it with the
+        ``defaults`` if it exists, otherwise creates a new one.
+        Returns a tuple (object, created), where created is a boolean
+        specifying whether an object was created.
+
+        Inserts a missing document with a single atomic upsert, like
+        get_or_create(), then updates an existing one by its ``_id``.
         """
+        return self._upsert(kwargs, defaults or {}, update=True)
+
+    def _upsert(self, lookup, defaults, update):
+        queryset = self.for_write().filter(**lookup)
+        params = dict((k, v) for k, v in lookup.items() if LOOKUP_SEP not in k)
+        params.update(defaults)
+        doc = self._document(**params)
+
+        # $set the non-None defaults and $unset the None ones, which
+        # to_mongo() leaves out.
+        set_fields, unset_fields = {}, {}
+        if update:
+            for name in defaults:
+                field = doc._fields[name]
+                value = doc._data.get(name)
+                if value is None:
+                    unset_fields[field.db_field] = 1
+                else:
+                    field.validate(value)
+                    set_fields[field.db_field] = field.to_mongo(value)
+
+        collection = queryset._collection
+        raw = None
         try:
-            obj = self.create(**params)
-            return obj, True
-        except NotUniqueError:
-            exc_info = sys.exc_info()
+            doc.validate()
+        except ValidationError:
+            # An invalid document can't be inserted, but an existing one is
+            # returned as it is stored.
+            raw = self._find_single(collection, queryset._query)
+            if raw is None:
+                raise
+
+        if raw is None:
+            if doc.pk is None:
+                id_field = doc._meta['id_field']
+                setattr(doc, id_field,
+                        doc._fields[id_field].to_python(ObjectId()))
+            update_doc = {'$setOnInsert': doc.to_mongo()}
             try:
-                return self.get(**lookup), False
-            except self.model.DoesNotExist:
-                pass
-            six.reraise(*exc_info)
+                try:
+                    raw = collection.find_one_and_update(
+                        queryset._query, update_doc, upsert=True,
+                        return_document=ReturnDocument.BEFORE)
+                except DuplicateKeyError:
+                    # A concurrent upsert inserted the document first; now
+                    # the query matches it.
+                    raw = collection.find_one_and_update(
+                        queryset._query, update_doc, upsert=True,
+                        return_document=ReturnDocument.BEFORE)
+            except DuplicateKeyError as err:
+                raise NotUniqueError(
+                    "Tried to save duplicate unique keys (%s)" % err)
+            except OperationFailure as err:
+                raise OperationError("Could not save document (%s)" % err)
+            if raw is None:
+                doc._clear_changed_fields()
+                doc._created = False
+                return doc, True
+            # $setOnInsert left the matched document alone, make sure it is
+            # the only one like get() does.
+            self._find_single(collection, queryset._query, {'_id': 1})
+
+        if set_fields or unset_fields:
+            update_doc = {}
+            if set_fields:
+                update_doc['$set'] = set_fields
+            if unset_fields:
+                update_doc['$unset'] = unset_fields
+            raw = collection.find_one_and_update(
+                {'_id': raw['_id']}, update_doc,
+                return_document=ReturnDocument.AFTER)
+        return self._document._from_son(raw), False
 
+    def _find_single(self, collection, query, projection=None):
+        """
+        Returns the raw document matching ``query``, None if there's none,
+        and raises MultipleObjectsReturned if there are several.
+        """
+        rows = list(collection.find(query, projection).limit(2))
+        if len(rows) > 1:
+            raise self._document.MultipleObjectsReturned(
+                "2 or more items returned, instead of 1")
+        return rows[0] if rows else None
 
+    def bulk_create(self, objs, batch_size=None):
+        """
+        Validates and inserts the given documents with unordered
+        ``insert_many`` calls of at most ``batch_size`` documents, and sets
+        the generated primary keys on them. Returns the documents.
+        """
+        collection = self.for_write()._collection
+        objs = list(objs)
+        for obj in objs:
+            if not isinstance(obj, self._document):
+                raise OperationError("Some documents inserted aren't "
+                                     "instances of %s" % self._document)
+            obj.validate()
+        if not objs:
+            return objs
+        signals.pre_bulk_insert.send(self._document, documents=objs)
+        batch_size = batch_size or len(objs)
+        for start in range(0, len(objs), batch_size):
+            batch = objs[start:start + batch_size]
+            try:
+                result = collection.insert_many(
+                    [obj.to_mongo() for obj in batch], ordered=False)
+            except BulkWriteError as err:
+                codes = set(e.get('code') for e in err.details['writeErrors'])
+                if codes & set([11000, 11001]):
+                    raise NotUniqueError(
+                        "Tried to save duplicate unique keys (%s)" % err)
+                raise OperationError("Could not save document (%s)" % err)
+            for obj, pk in zip(batch, result.inserted_ids):
+                id_field = obj._meta['id_field']
+                setattr(obj, id_field, obj._fields[id_field].to_python(pk))
+                obj._clear_changed_fields()
+                obj._created = False
+        signals.post_bulk_insert.send(self._document, documents=objs,
+                                      loaded=False)
+        return objs
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        """
+        Writes the given fields of the given documents with one unordered
+        ``bulk_write`` of ``UpdateOne`` operations per ``batch_size``
+        documents. Returns the number of matched documents.
+        """
+        collection = self.for_write()._collection
+        objs = list(objs)
+        if not fields:
+            raise ValueError('Field names must be given to bulk_update().')
+        id_field = self._document._meta['id_field']
+        fields = [self._document._fields[name] for name in fields]
+        if any(f.name == id_field for f in fields):
+            raise ValueError('bulk_update() cannot be used with primary key '
+                             'fields.')
+        if any(obj.pk is None for obj in objs):
+            raise ValueError('All bulk_update() objects must have a primary '
+                             'key set.')
+        if not objs:
+            return 0
+
+        requests = []
+        for obj in objs:
+            update = {}
+            for field in fields:
+                value = obj._data.get(field.name)
+                if value is None:
+                    update.setdefault('$unset', {})[field.db_field] = 1
+                else:
+                    update.setdefault('$set', {})[field.db_field] = (
+                        field.to_mongo(value))
+            pk = obj._fields[id_field].to_mongo(obj.pk)
+            requests.append(UpdateOne({'_id': pk}, update))
+
+        matched = 0
+        batch_size = batch_size or len(requests)
+        for start in range(0, len(requests), batch_size):
+            try:
+                result = collection.bulk_write(
+                    requests[start:start + batch_size], ordered=False)
+            except BulkWriteError as err:
+                raise OperationError("Could not save document (%s)" % err)
+            matched += result.matched_count
+        return matched
 
 
 class QuerySetManager(qs.QuerySetManager):
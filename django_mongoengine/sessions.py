@@ -1,13 +1,18 @@
+import hashlib
 import logging
+import zlib
 from django.conf import settings
 from django.contrib.sessions.backends.base import SessionBase, CreateError
+from django.contrib.sessions.exceptions import SuspiciousSession
 from django.core.exceptions import SuspiciousOperation
+from django.utils import six
+from django.utils.crypto import constant_time_compare, salted_hmac
 
-from bson import json_util
+from bson import BSON, Binary, json_util
+from pymongo.errors import DuplicateKeyError
 
 from mongoengine.document import Document
 from mongoengine import fields
-from mongoengine.queryset import OperationError
 from mongoengine.connection import DEFAULT_CONNECTION_NAME
 
 from .utils import datetime_now, force_text
@@ -22,16 +27,35 @@ MONGOENGINE_SESSION_COLLECTION = getattr(
     settings, 'MONGOENGINE_SESSION_COLLECTION',
     'django_session')
 
-# a setting for whether session data is stored encoded or not
+# a setting for whether session data is stored encoded or not: True for
+# django's signed base64 strings, 'binary' for signed BSON binary data
+# (sessions stored as strings are still read), False for plain dicts
 MONGOENGINE_SESSION_DATA_ENCODE = getattr(
     settings, 'MONGOENGINE_SESSION_DATA_ENCODE',
     True)
 
+# a setting for the size in bytes above which binary session data is
+# compressed with zlib; None to never compress
+MONGOENGINE_SESSION_COMPRESS_THRESHOLD = getattr(
+    settings, 'MONGOENGINE_SESSION_COMPRESS_THRESHOLD',
+    None)
+
+# first byte of the binary session data
+BINARY_PLAIN = b'\x00'
+BINARY_ZLIB = b'\x01'
+
+
+def _session_data_field():
+    if MONGOENGINE_SESSION_DATA_ENCODE == 'binary':
+        return fields.DynamicField()
+    elif MONGOENGINE_SESSION_DATA_ENCODE:
+        return fields.StringField()
+    return fields.DictField()
+
 
 class MongoSession(Document):
     session_key = fields.StringField(primary_key=True, max_length=40)
-    session_data = fields.StringField() if MONGOENGINE_SESSION_DATA_ENCODE \
-                                        else fields.DictField()
+    session_data = _session_data_field()
     expire_date = fields.DateTimeField()
 
     meta = {
@@ -47,31 +71,111 @@ class MongoSession(Document):
     }
 
     def get_decoded(self):
-        return SessionStore().decode(self.session_data)
+        return SessionStore()._decode_session(
+            {'session_data': self.session_data})
 
 
 class SessionStore(SessionBase):
     """A MongoEngine-based session store for Django.
     """
+    data_encode = MONGOENGINE_SESSION_DATA_ENCODE
+    compress_threshold = MONGOENGINE_SESSION_COMPRESS_THRESHOLD
+    _data_digest = None
 
-    def load(self):
+    def _get_session_from_db(self, fields=('session_data',)):
+        """
+        Returns the raw unexpired session document, with only the given
+        fields, or None.
+        """
+        projection = dict((field, True) for field in fields)
+        projection['_id'] = False
+        s = MongoSession._get_collection().find_one(
+            {'_id': self.session_key, 'expire_date': {'$gt': datetime_now()}},
+            projection)
+        if s is None:
+            self._session_key = None
+        return s
+
+    def _decode_session(self, s):
+        session_data = s.get('session_data')
+        if not self.data_encode or session_data is None:
+            return session_data or {}
         try:
-            s = MongoSession.objects(session_key=self.session_key,
-                                     expire_date__gt=datetime_now)[0]
-            if MONGOENGINE_SESSION_DATA_ENCODE:
-                return self.decode(force_text(s.session_data))
+            if isinstance(session_data, six.text_type):
+                return self.decode(session_data)
+            return self.decode_binary(session_data)
+        except SuspiciousOperation as e:
+            logger = logging.getLogger('django.security.%s' %
+                    e.__class__.__name__)
+            logger.warning(force_text(e))
+            self._session_key = None
+            return {}
+
+    def _encode_session(self, data):
+        if self.data_encode == 'binary':
+            return self.encode_binary(data)
+        elif self.data_encode:
+            return self.encode(data)
+        return data
+
+    def _binary_hash(self, value):
+        key_salt = "django.contrib.sessions" + self.__class__.__name__
+        return salted_hmac(key_salt, value).digest()
+
+    def encode_binary(self, session_dict):
+        """
+        Returns the given session dictionary serialized, compressed if it's
+        larger than ``compress_threshold``, and signed, as BSON binary data.
+        """
+        serialized = self.serializer().dumps(session_dict)
+        if (self.compress_threshold is not None and
+                len(serialized) > self.compress_threshold):
+            serialized = BINARY_ZLIB + zlib.compress(serialized)
+        else:
+            serialized = BINARY_PLAIN + serialized
+        return Binary(self._binary_hash(serialized) + serialized)
+
+    def decode_binary(self, session_data):
+        hash_size = hashlib.sha1().digest_size
+        try:
+            session_data = bytes(session_data)
+            hash = session_data[:hash_size]
+            serialized = session_data[hash_size:]
+            # check the signature before decompressing anything
+            if not constant_time_compare(hash, self._binary_hash(serialized)):
+                raise SuspiciousSession("Session data corrupted")
+            if serialized[:1] == BINARY_ZLIB:
+                serialized = zlib.decompress(serialized[1:])
             else:
-                return s.session_data
-        except (IndexError, SuspiciousOperation) as e:
+                serialized = serialized[1:]
+            return self.serializer().loads(serialized)
+        except Exception as e:
+            # zlib or unserializing errors, SuspiciousSession. If any of
+            # these happen, just return an empty dictionary (an empty session).
             if isinstance(e, SuspiciousOperation):
                 logger = logging.getLogger('django.security.%s' %
                         e.__class__.__name__)
                 logger.warning(force_text(e))
-            self._session_key = None
             return {}
 
+    def _digest(self, data):
+        return hashlib.md5(self.serializer().dumps(data)).digest()
+
+    def _remember(self, data):
+        # Unmodified sessions are only saved with SESSION_SAVE_EVERY_REQUEST;
+        # the digest lets save() tell whether their data really changed.
+        if settings.SESSION_SAVE_EVERY_REQUEST:
+            self._data_digest = self._digest(data)
+
+    def load(self):
+        s = self._get_session_from_db()
+        data = {} if s is None else self._decode_session(s)
+        self._remember(data)
+        return data
+
     def exists(self, session_key):
-        return bool(MongoSession.objects(session_key=session_key).first())
+        return MongoSession._get_collection().find_one(
+            {'_id': session_key}, {'_id': True}) is not None
 
     def create(self):
         while True:
@@ -85,20 +189,33 @@ class SessionStore(SessionBase):
 
     def save(self, must_create=False):
         if self.session_key is None:
-            self.create()
+            return self.create()
         data = self._get_session(no_load=must_create)
-        s = MongoSession(session_key=self.session_key)
-        if MONGOENGINE_SESSION_DATA_ENCODE:
-            s.session_data = self.encode(data)
-        else:
-            s.session_data = data
-        s.expire_date = self.get_expiry_date()
-        try:
-            s.save(force_insert=must_create)
-        except OperationError:
-            if must_create:
+        expire_date = self.get_expiry_date()
+        collection = MongoSession._get_collection()
+        if must_create:
+            try:
+                collection.insert_one({
+                    '_id': self.session_key,
+                    'session_data': self._encode_session(data),
+                    'expire_date': expire_date,
+                })
+            except DuplicateKeyError:
                 raise CreateError
-            raise
+            return
+        if (not self.modified and self._data_digest is not None and
+                self._digest(data) == self._data_digest):
+            # only the expiry moved, no need to encode and rewrite the data
+            result = collection.update_one(
+                {'_id': self.session_key},
+                {'$set': {'expire_date': expire_date}})
+            if result.matched_count:
+                return
+        collection.update_one(
+            {'_id': self.session_key},
+            {'$set': {'session_data': self._encode_session(data),
+                      'expire_date': expire_date}},
+            upsert=True)
 
     def delete(self, session_key=None):
         if session_key is None:
@@ -107,6 +224,33 @@ class SessionStore(SessionBase):
             session_key = self.session_key
         MongoSession.objects(session_key=session_key).delete()
 
+    @classmethod
+    def clear_expired(cls, batch_size=1000):
+        """
+        Deletes the expired sessions ``batch_size`` at a time, each batch
+        being a range of ``_id``, so that no single delete runs for long.
+        The TTL index does the same, but only once a minute and it can lag
+        behind under load. Returns the number of deleted sessions.
+        """
+        collection = MongoSession._get_collection()
+        expired = {'expire_date': {'$lt': datetime_now()}}
+        deleted = 0
+        last_key = None
+        while True:
+            query = dict(expired)
+            if last_key is not None:
+                query['_id'] = {'$gt': last_key}
+            keys = [s['_id'] for s in collection.find(query, {'_id': True})
+                    .sort('_id', 1).limit(batch_size)]
+            if not keys:
+                break
+            query['_id'] = {'$gte': keys[0], '$lte': keys[-1]}
+            deleted += collection.delete_many(query).deleted_count
+            if len(keys) < batch_size:
+                break
+            last_key = keys[-1]
+        return deleted
+
 
 class BSONSerializer(object):
     """
@@ -117,3 +261,16 @@ class BSONSerializer(object):
 
     def loads(self, data):
         return json_util.loads(data.decode('ascii'))
+
+
+class BSONBinarySerializer(object):
+    """
+    Serializer producing BSON documents, more compact than the JSON of
+    ``BSONSerializer``; meant for ``MONGOENGINE_SESSION_DATA_ENCODE =
+    'binary'``.
+    """
+    def dumps(self, obj):
+        return BSON.encode(obj)
+
+    def loads(self, data):
+        return BSON(data).decode()
@@ -0,0 +1,79 @@
+"""
+Cached, MongoDB-backed sessions: reads go through the ``SESSION_CACHE_ALIAS``
+cache, writes go through to MongoDB. The counterpart of django's
+``cached_db`` backend::
+
+    SESSION_ENGINE = 'django_mongoengine.sessions_cached'
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .sessions import SessionStore as MongoStore
+
+KEY_PREFIX = "django_mongoengine.sessions_cached"
+
+
+class SessionStore(MongoStore):
+    """
+    Implements cached, MongoDB backed sessions.
+    """
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        self._cache = caches[settings.SESSION_CACHE_ALIAS]
+        super(SessionStore, self).__init__(session_key)
+
+    @property
+    def cache_key(self):
+        return self.cache_key_prefix + self._get_or_create_session_key()
+
+    def load(self):
+        try:
+            data = self._cache.get(self.cache_key)
+        except Exception:
+            # Some backends (e.g. memcache) raise an exception on invalid
+            # cache keys. If this happens, reset the session.
+            data = None
+
+        if data is None:
+            s = self._get_session_from_db(
+                fields=('session_data', 'expire_date'))
+            if s is None:
+                return {}
+            data = self._decode_session(s)
+            if self.session_key is not None:
+                expiry = s['expire_date']
+                if settings.USE_TZ and timezone.is_naive(expiry):
+                    # pymongo returns naive UTC datetimes unless tz_aware
+                    expiry = timezone.make_aware(expiry, timezone.utc)
+                self._cache.set(self.cache_key, data,
+                                self.get_expiry_age(expiry=expiry))
+        self._remember(data)
+        return data
+
+    def exists(self, session_key):
+        if session_key and (self.cache_key_prefix + session_key) in self._cache:
+            return True
+        return super(SessionStore, self).exists(session_key)
+
+    def save(self, must_create=False):
+        super(SessionStore, self).save(must_create)
+        self._cache.set(self.cache_key, self._session, self.get_expiry_age())
+
+    def delete(self, session_key=None):
+        super(SessionStore, self).delete(session_key)
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        self._cache.delete(self.cache_key_prefix + session_key)
+
+    def flush(self):
+        """
+        Removes the current session data from the database and regenerates the
+        key.
+        """
+        self.clear()
+        self.delete(self.session_key)
+        self._session_key = None
@@ -0,0 +1,104 @@
+"""
+Connection pool handling for the ``MONGODB_DATABASES`` setting.
+
+Besides the arguments understood by ``mongoengine.register_connection``, every
+alias accepts the pool options ``maxPoolSize``, ``minPoolSize`` and
+``waitQueueTimeoutMS``, and ``warm_up``, which connects as soon as the worker
+starts. Set ``connect`` to ``False`` so that no socket or monitor thread
+exists before the server forks its workers.
+
+Clients must not be shared across ``fork()``. On python 3.7+ the connections
+are reset in the child automatically; with older pythons call
+:func:`reset_connections` from the server's post fork hook, e.g. gunicorn's
+``post_fork`` or uwsgi's ``@postfork``.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import six
+
+from mongoengine import connection
+from mongoengine.base.common import _document_registry
+
+POOL_SIZE_OPTIONS = ('maxPoolSize', 'minPoolSize')
+POOL_TIMEOUT_OPTIONS = ('waitQueueTimeoutMS',)
+
+# aliases to warm up at worker start
+warm_up_aliases = set()
+
+
+def get_connection_settings(alias, conn_settings):
+    """
+    Validates the settings of one ``MONGODB_DATABASES`` alias and returns
+    the keyword arguments for ``register_connection`` and the ``warm_up``
+    flag.
+    """
+    conn_settings = dict(conn_settings)
+    warm_up = conn_settings.pop('warm_up', False)
+
+    for option in POOL_SIZE_OPTIONS + POOL_TIMEOUT_OPTIONS:
+        value = conn_settings.get(option)
+        if value is None:
+            continue
+        if option in POOL_SIZE_OPTIONS:
+            types, kind = six.integer_types, 'integer'
+        else:
+            types, kind = six.integer_types + (float,), 'number'
+        if (not isinstance(value, types) or isinstance(value, bool) or
+                value < 0):
+            raise ImproperlyConfigured(
+                "MONGODB_DATABASES['%s']['%s'] must be a non-negative %s, "
+                "got %r" % (alias, option, kind, value))
+    min_size = conn_settings.get('minPoolSize')
+    max_size = conn_settings.get('maxPoolSize')
+    if min_size and max_size and min_size > max_size:
+        raise ImproperlyConfigured(
+            "MONGODB_DATABASES['%s']['minPoolSize'] can't be greater than "
+            "maxPoolSize" % alias)
+    return conn_settings, warm_up
+
+
+def register_connections(databases):
+    """
+    Registers every alias of the ``MONGODB_DATABASES`` setting and warms up
+    the pools that ask for it.
+    """
+    warm_up_aliases.clear()
+    for alias, conn_settings in databases.items():
+        conn_settings, warm_up = get_connection_settings(alias, conn_settings)
+        connection.register_connection(alias, **conn_settings)
+        if warm_up:
+            warm_up_aliases.add(alias)
+    warm_up_connections()
+
+
+def warm_up_connections(aliases=None):
+    """
+    Connects the given aliases (by default the ones with ``warm_up``), so
+    that the first requests don't pay for the connection setup. pymongo
+    then fills their pools up to ``minPoolSize`` in the background.
+    """
+    for alias in warm_up_aliases if aliases is None else aliases:
+        connection.get_connection(alias).admin.command('ping')
+
+
+def reset_connections():
+    """
+    Drops the clients, databases and collections inherited from the parent
+    process without closing their sockets, which still belong to the parent.
+    New clients are created on first use.
+    """
+    connection._connections.clear()
+    connection._dbs.clear()
+    for document in _document_registry.values():
+        if document.__dict__.get('_collection') is not None:
+            document._collection = None
+
+
+def _after_fork_in_child():
+    reset_connections()
+    warm_up_connections()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
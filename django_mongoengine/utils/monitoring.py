@@ -0,0 +1,193 @@
+"""
+MongoDB command monitoring: the equivalent of django's ``connection.queries``
+and of its slow query logging.
+
+Commands are recorded per thread when ``DEBUG`` is on or while a
+:class:`CaptureQueriesContext` is active, and the buffer is cleared on
+every ``request_started``. Commands slower than the
+``MONGODB_SLOW_QUERY_MS`` setting are logged to the
+``django_mongoengine.queries`` logger.
+"""
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.utils import six
+
+from pymongo import monitoring
+
+logger = logging.getLogger('django_mongoengine.queries')
+
+# same limit as django's BaseDatabaseWrapper.queries_limit
+QUERIES_LIMIT = 9000
+
+# connection handshake and authentication, not issued by application code
+IGNORED_COMMANDS = frozenset([
+    'ismaster', 'isMaster', 'hello', 'saslStart', 'saslContinue',
+    'getnonce', 'authenticate', 'endSessions',
+])
+
+
+class QueryLog(threading.local):
+
+    def __init__(self):
+        self.queries = deque(maxlen=QUERIES_LIMIT)
+        self.pending = {}
+        self.force = 0
+
+query_log = QueryLog()
+
+
+def get_queries():
+    """
+    Returns the commands recorded in the current thread since the last
+    reset, as dicts with ``alias``, ``command``, ``collection``, ``query``,
+    ``time`` (in seconds, as a string) and ``failed`` keys.
+    """
+    return list(query_log.queries)
+
+
+def reset_queries(**kwargs):
+    query_log.queries.clear()
+
+
+class CommandLogger(monitoring.CommandListener):
+    """
+    Records the commands sent by pymongo and logs the slow ones.
+    ``aliases`` maps database names to the connection aliases.
+    """
+
+    def __init__(self, aliases=None):
+        self.aliases = aliases or {}
+        self.installed = False
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        record = settings.DEBUG or query_log.force
+        threshold = getattr(settings, 'MONGODB_SLOW_QUERY_MS', None)
+        if not record and threshold is None:
+            return
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, six.string_types):
+            collection = None
+        query_log.pending[event.connection_id, event.request_id] = (
+            self.aliases.get(event.database_name, event.database_name),
+            collection,
+            event.command if record else None,
+            threshold,
+        )
+
+    def succeeded(self, event):
+        self._finish(event, False)
+
+    def failed(self, event):
+        self._finish(event, True)
+
+    def _finish(self, event, failed):
+        try:
+            alias, collection, command, threshold = query_log.pending.pop(
+                (event.connection_id, event.request_id))
+        except KeyError:
+            return
+        duration = event.duration_micros / 1000000.0
+        if threshold is not None and duration * 1000 >= threshold:
+            logger.warning('(%.3f) %s on %s.%s', duration, event.command_name,
+                           alias, collection,
+                           extra={'duration': duration, 'alias': alias,
+                                  'command': command})
+        if command is not None:
+            query_log.queries.append({
+                'alias': alias,
+                'command': event.command_name,
+                'collection': collection,
+                'query': command,
+                'time': '%.3f' % duration,
+                'failed': failed,
+            })
+
+
+command_logger = CommandLogger()
+
+
+def install(databases):
+    """
+    Registers the command listener for the databases of the
+    ``MONGODB_DATABASES`` setting. Must run before the connections are
+    opened; calling it again only refreshes the aliases.
+    """
+    from django.core.signals import request_started
+
+    command_logger.aliases = dict(
+        (conn_settings.get('name', alias), alias)
+        for alias, conn_settings in databases.items())
+    if not command_logger.installed:
+        monitoring.register(command_logger)
+        command_logger.installed = True
+    request_started.connect(reset_queries,
+                            dispatch_uid='django_mongoengine_reset_queries')
+
+
+class CaptureQueriesContext(object):
+    """
+    Context manager that records the MongoDB commands run in the current
+    thread, regardless of ``DEBUG``.
+    """
+
+    def __iter__(self):
+        return iter(self.captured_queries)
+
+    def __getitem__(self, index):
+        return self.captured_queries[index]
+
+    def __len__(self):
+        return len(self.captured_queries)
+
+    @property
+    def captured_queries(self):
+        return list(query_log.queries)[self.initial_queries:self.final_queries]
+
+    def __enter__(self):
+        query_log.force += 1
+        self.initial_queries = len(query_log.queries)
+        self.final_queries = None
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        query_log.force -= 1
+        self.final_queries = len(query_log.queries)
+
+
+class _AssertNumQueriesContext(CaptureQueriesContext):
+
+    def __init__(self, test_case, num):
+        self.test_case = test_case
+        self.num = num
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super(_AssertNumQueriesContext, self).__exit__(
+            exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        executed = len(self)
+        self.test_case.assertEqual(
+            executed, self.num,
+            "%d mongo queries executed, %d expected\nCaptured queries were:\n%s" % (
+                executed, self.num,
+                '\n'.join('%s on %s' % (q['command'], q['collection'])
+                          for q in self.captured_queries)))
+
+
+class MongoQueriesTestMixin(object):
+    """
+    Adds ``assertNumMongoQueries`` to a test case, which works like django's
+    ``assertNumQueries``.
+    """
+
+    def assertNumMongoQueries(self, num, func=None, *args, **kwargs):
+        context = _AssertNumQueriesContext(self, num)
+        if func is None:
+            return context
+        with context:
+            func(*args, **kwargs)
@@ -1,13 +1,52 @@
-import imp
-import importlib
-
-def get_patched_django_module(modname, **kwargs):
-    parent, m = modname.rsplit(".", 1)
-    path = importlib.import_module(parent).__path__
-    mod = imp.load_module(
-        ".".join([__name__, modname.replace(".", "_")]),
-        *imp.find_module(m, path)
-    )
-    for k, v in kwargs.items():
-        setattr(mod, k, v)
-    return mod
+import functools
+import types
+
+
+def _code_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def rebind_globals(func, globals_):
+    """
+    Returns a copy of ``func`` which looks up its global names in
+    ``globals_``.
+    """
+    new_func = types.FunctionType(func.__code__, globals_, func.__name__,
+                                  func.__defaults__, func.__closure__)
+    functools.update_wrapper(new_func, func)
+    if getattr(func, '__kwdefaults__', None):
+        new_func.__kwdefaults__ = dict(func.__kwdefaults__)
+    return new_func
+
+
+def patch_globals(source, **names):
+    """
+    Class decorator copying into the decorated class the methods of the
+    django class ``source`` that use any of the given global ``names``,
+    rebound so that they see the given values instead of the ones of their
+    django module. Methods defined by the decorated class are left alone.
+    """
+    def decorator(cls):
+        globals_ = None
+        for key, value in list(source.__dict__.items()):
+            if key in cls.__dict__:
+                continue
+            func = value
+            if isinstance(value, (staticmethod, classmethod)):
+                func = value.__func__
+            if not isinstance(func, types.FunctionType):
+                continue
+            if not _code_names(func.__code__) & set(names):
+                continue
+            if globals_ is None:
+                globals_ = dict(func.__globals__, **names)
+            new_func = rebind_globals(func, globals_)
+            if isinstance(value, (staticmethod, classmethod)):
+                new_func = type(value)(new_func)
+            setattr(cls, key, new_func)
+        return cls
+    return decorator
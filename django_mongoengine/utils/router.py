@@ -0,0 +1,68 @@
+"""
+Database routing for querysets, the equivalent of django's ``DATABASE_ROUTERS``.
+
+``MONGODB_ROUTERS`` is a list of router classes (or dotted paths to them).
+A router may define any of these methods, each returning ``None`` to let the
+next router decide:
+
+* ``db_for_read(document, **hints)``: the alias to read from.
+* ``db_for_write(document, **hints)``: the alias to write to.
+* ``read_preference(document, **hints)``: a ``pymongo.ReadPreference`` for
+  the reads, e.g. ``ReadPreference.SECONDARY_PREFERRED``.
+
+The hints hold the ``queryset`` being evaluated. Only queryset operations are
+routed: ``Document.save()`` and ``Document.delete()`` keep using the
+document's ``db_alias``, and ``QuerySet.using()`` overrides the routers.
+"""
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+from django.utils import six
+
+
+class ConnectionRouter(object):
+
+    def __init__(self, routers=None):
+        self._routers = routers
+
+    @cached_property
+    def routers(self):
+        if self._routers is None:
+            self._routers = getattr(settings, 'MONGODB_ROUTERS', [])
+        routers = []
+        for router in self._routers:
+            if isinstance(router, six.string_types):
+                router = import_string(router)()
+            elif isinstance(router, type):
+                router = router()
+            routers.append(router)
+        return routers
+
+    def _router_func(action):
+        def _route_db(self, document, **hints):
+            for router in self.routers:
+                try:
+                    method = getattr(router, action)
+                except AttributeError:
+                    # If the router doesn't have a method, skip to the next one.
+                    continue
+                chosen = method(document, **hints)
+                if chosen is not None:
+                    return chosen
+            return None
+        return _route_db
+
+    db_for_read = _router_func('db_for_read')
+    db_for_write = _router_func('db_for_write')
+    read_preference = _router_func('read_preference')
+
+router = ConnectionRouter()
+
+
+@receiver(setting_changed)
+def reset_routers(**kwargs):
+    if kwargs['setting'] == 'MONGODB_ROUTERS':
+        router._routers = None
+        router.__dict__.pop('routers', None)
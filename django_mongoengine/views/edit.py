@@ -1,25 +1,36 @@
 from django.utils import six
 from django.core.exceptions import ImproperlyConfigured
+from django.views.generic import edit as djmod
 
 from django_mongoengine.utils.wrappers import WrapDocument, copy_class
-from django_mongoengine.utils.monkey import get_patched_django_module
+from django_mongoengine.utils.monkey import patch_globals
 from django_mongoengine.forms.documents import documentform_factory
 
 from .detail import SingleObjectMixin, SingleObjectTemplateResponseMixin
 
-djmod = get_patched_django_module(
-    "django.views.generic.edit",
-    model_forms=get_patched_django_module(
-        "django.forms.models", modelform_factory=documentform_factory,
-    )
-)
+
+class model_forms(object):
+    # stands for django.forms.models in ModelFormMixin.get_form_class()
+    modelform_factory = staticmethod(documentform_factory)
+
 
 class WrapDocumentForm(WrapDocument, djmod.FormMixinBase):
     pass
 
 
+@patch_globals(djmod.ModelFormMixin, model_forms=model_forms)
 class DocumentFormFixin(SingleObjectMixin):
 
+    def get_queryset(self):
+        """
+        Reads the object from where it will be written, so that it's never
+        edited from a lagging secondary.
+        """
+        queryset = super(DocumentFormFixin, self).get_queryset()
+        if hasattr(queryset, 'for_write'):
+            queryset = queryset.for_write()
+        return queryset
+
     def get_success_url(self):
         """
         Returns the supplied URL.
@@ -1,27 +1,56 @@
+from django.core.paginator import InvalidPage
+from django.http import Http404
 from django.utils import six
+from django.utils.translation import ugettext as _
+from django.views.generic import list as djmod
 
 from mongoengine.queryset import QuerySet
 
 from django_mongoengine.utils.wrappers import WrapDocument, copy_class
-from django_mongoengine.utils.monkey import get_patched_django_module
+from django_mongoengine.utils.monkey import patch_globals
+from django_mongoengine.paginator import KeysetPaginator
 
 __all__ = [
     "MultipleObjectMixin",
     "ListView",
 ]
 
-djmod = get_patched_django_module("django.views.generic.list",
-    QuerySet=QuerySet,
-)
 
+@patch_globals(djmod.MultipleObjectMixin, QuerySet=QuerySet)
 @six.add_metaclass(WrapDocument)
 class MultipleObjectMixin(djmod.MultipleObjectMixin):
-    pass
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Paginate the queryset, if needed. With a ``KeysetPaginator`` as
+        ``paginator_class`` the page is given by the ``cursor_kwarg`` cursor
+        instead of a page number.
+        """
+        if not issubclass(self.paginator_class, KeysetPaginator):
+            return super(MultipleObjectMixin, self).paginate_queryset(
+                queryset, page_size)
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty())
+        cursor = (self.kwargs.get(self.cursor_kwarg) or
+                  self.request.GET.get(self.cursor_kwarg))
+        try:
+            page = paginator.page(cursor)
+        except InvalidPage as e:
+            raise Http404(_('Invalid page (%(page_number)s): %(message)s') % {
+                'page_number': cursor,
+                'message': str(e)
+            })
+        return (paginator, page, page.object_list, page.has_other_pages())
 
 @six.add_metaclass(WrapDocument)
 class MultipleObjectTemplateResponseMixin(djmod.MultipleObjectTemplateResponseMixin):
     pass
 
+class BaseListView(MultipleObjectMixin, djmod.BaseListView):
+    __doc__ = djmod.BaseListView.__doc__
+
 @copy_class(djmod.ListView)
-class ListView(MultipleObjectTemplateResponseMixin, djmod.BaseListView):
+class ListView(MultipleObjectTemplateResponseMixin, BaseListView):
     __doc__ = djmod.ListView.__doc__
@@ -16,8 +16,10 @@ except AttributeError:
 from mongoengine import connect
 from mongoengine.connection import get_db
 
+from django_mongoengine.utils.monitoring import MongoQueriesTestMixin
 
-class MongoTestCase(test.SimpleTestCase):
+
+class MongoTestCase(MongoQueriesTestMixin, test.SimpleTestCase):
     """
     TestCase class that clear the collection between the tests
     """
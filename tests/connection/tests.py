@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# coding=utf-8
+from __future__ import absolute_import, division, print_function
+
+from django.core.exceptions import ImproperlyConfigured
+from mongoengine import connection as me_connection
+
+from django_mongoengine.utils import connection
+
+from tests import MongoTestCase
+
+from tests.queryset.models import Person
+
+
+class ConnectionSettingsTest(MongoTestCase):
+
+    def test_defaults(self):
+        conn_settings, warm_up = connection.get_connection_settings(
+            'default', {'name': 'test'})
+        self.assertEqual(conn_settings, {'name': 'test'})
+        self.assertFalse(warm_up)
+
+    def test_pool_options(self):
+        conn_settings, warm_up = connection.get_connection_settings(
+            'default', {'name': 'test', 'maxPoolSize': 50, 'minPoolSize': 5,
+                        'waitQueueTimeoutMS': 2.5, 'connect': False,
+                        'warm_up': True})
+        self.assertEqual(conn_settings, {
+            'name': 'test', 'maxPoolSize': 50, 'minPoolSize': 5,
+            'waitQueueTimeoutMS': 2.5, 'connect': False})
+        self.assertTrue(warm_up)
+
+    def test_invalid_pool_options(self):
+        for options in ({'maxPoolSize': '10'}, {'minPoolSize': -1},
+                        {'maxPoolSize': 2.5}, {'waitQueueTimeoutMS': -1.0},
+                        {'minPoolSize': 10, 'maxPoolSize': 5}):
+            with self.assertRaises(ImproperlyConfigured):
+                connection.get_connection_settings('default', options)
+
+    def test_reset_connections(self):
+        Person.objects.create(name='Joe', age=30)
+        client = me_connection.get_connection()
+        self.assertIsNotNone(Person._collection)
+
+        connection.reset_connections()
+
+        self.assertIsNone(Person._collection)
+        self.assertNotIn('default', me_connection._connections)
+        self.assertEqual(Person.objects.count(), 1)
+        self.assertIsNot(me_connection.get_connection(), client)
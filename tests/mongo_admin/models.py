@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# coding=utf-8
+from __future__ import absolute_import, division, print_function
+
+from django_mongoengine import Document
+from django_mongoengine import fields
+
+
+class Book(Document):
+    title = fields.StringField(max_length=100)
+    pages = fields.IntField()
+
+    def __unicode__(self):
+        return self.title or ''
+    __unicode__.admin_only_fields = ('title',)
+
+
+class Review(Document):
+    title = fields.StringField(max_length=100)
+    book = fields.ReferenceField(Book)
+
+
+class Article(Document):
+    title = fields.StringField(max_length=100)
+    body = fields.StringField()
+    slug = fields.StringField()
+
+    meta = {'indexes': [{'fields': ['$title', '$body']}, 'slug']}
@@ -0,0 +1,379 @@
+#!/usr/bin/env python
+# coding=utf-8
+from __future__ import absolute_import, division, print_function
+
+import re
+from unittest import skipUnless
+
+from django.contrib.admin import helpers
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.messages.storage.cookie import CookieStorage
+from mongoengine import signals
+from mongoengine.queryset import QuerySetNoCache
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from django_mongoengine.mongo_admin import DocumentAdmin, site
+from django_mongoengine.mongo_admin.actions import delete_selected
+from django_mongoengine.mongo_admin.checks import DocumentAdminChecks
+from django_mongoengine.mongo_admin.util import str_queryset
+from django_mongoengine.mongo_admin.views import CappedCount, CURSOR_VAR
+from django_mongoengine.paginator import KeysetPaginator
+
+from tests import MongoTestCase
+
+from . import urls
+from .models import Article, Book, Review
+
+
+class Superuser(object):
+    pk = 1
+    is_active = is_staff = True
+
+    def has_perm(self, perm):
+        return True
+
+    def has_module_perms(self, app_label):
+        return True
+
+
+class BookAdmin(DocumentAdmin):
+    list_display = ('title', 'pages')
+    list_per_page = 5
+
+
+class ArticleAdmin(DocumentAdmin):
+    list_display = ('title', 'slug')
+    search_fields = ('title', 'body', '^slug')
+    search_mode = 'text'
+
+
+class ChangeListTestCase(MongoTestCase):
+
+    def setUp(self):
+        Book.drop_collection()
+        for i in range(30):
+            Book(title="Book %d" % i, pages=i).save()
+        self.admin = BookAdmin(Book, site)
+
+    def changelist(self, **params):
+        request = RequestFactory().get('/', params)
+        ChangeList = self.admin.get_changelist(request)
+        return ChangeList(
+            request, Book, self.admin.list_display, ('title',), (), None, (),
+            False, self.admin.list_per_page, self.admin.list_max_show_all, (),
+            self.admin)
+
+
+class CountTest(ChangeListTestCase):
+
+    def test_exact_counts(self):
+        cl = self.changelist(pages__gte='5')
+        self.assertEqual(cl.result_count, 25)
+        self.assertEqual(cl.full_result_count, 30)
+        self.assertEqual(cl.paginator.num_pages, 5)
+        self.assertEqual(len(cl.result_list), 5)
+
+    def test_skip_full_count(self):
+        self.admin.show_full_result_count = False
+        cl = self.changelist(pages__gte='5')
+        self.assertIsNone(cl.full_result_count)
+        self.assertTrue(cl.show_admin_actions)
+
+    def test_approximate_count(self):
+        self.admin.approximate_count = True
+        self.admin.count_limit = 10
+        cl = self.changelist()
+        self.assertEqual(cl.result_count, 30)
+        self.assertEqual(cl.full_result_count, 30)
+
+        cl = self.changelist(pages__gte='5')
+        self.assertIsInstance(cl.result_count, CappedCount)
+        self.assertEqual(cl.result_count, 10)
+        self.assertEqual(str(cl.result_count), "10+")
+        self.assertEqual(cl.full_result_count, 30)
+        self.assertFalse(cl.can_show_all)
+        self.assertEqual(cl.paginator.num_pages, 2)
+
+    def test_approximate_count_deep_page(self):
+        self.admin.approximate_count = True
+        self.admin.count_limit = 10
+        cl = self.changelist(pages__gte='5', p='4')
+        self.assertEqual(cl.result_count, 25)
+        self.assertEqual([b.pages for b in cl.result_list],
+                         [25, 26, 27, 28, 29])
+
+
+class KeysetTest(ChangeListTestCase):
+
+    def setUp(self):
+        super(KeysetTest, self).setUp()
+        Book.objects.filter(pages__gt=7).update(set__pages=7)
+        self.admin.paginator = KeysetPaginator
+
+    def test_pages(self):
+        # ordered on pages, which has many duplicates
+        cl = self.changelist(o='1')
+        titles = []
+        while True:
+            titles.extend(b.title for b in cl.result_list)
+            if not cl.cursor_page.has_next():
+                break
+            cl = self.changelist(o='1', cursor=cl.cursor_page.next_cursor)
+        self.assertEqual(titles, [b.title for b in Book.objects.order_by(
+            'pages', 'pk')])
+
+        cl = self.changelist(o='1', cursor=cl.cursor_page.previous_cursor)
+        self.assertEqual([b.title for b in cl.result_list], titles[-10:-5])
+
+    def test_links_drop_cursor(self):
+        cursor = self.changelist().cursor_page.next_cursor
+        cl = self.changelist(cursor=cursor)
+        self.assertNotIn(CURSOR_VAR, cl.params)
+        self.assertEqual(cl.get_query_string({'o': '1'}), '?o=1')
+
+    def test_invalid_cursor(self):
+        self.assertRaises(IncorrectLookupParameters, self.changelist,
+                          cursor='frog')
+
+
+class ProjectionTest(ChangeListTestCase):
+
+    def test_displayed_fields(self):
+        self.admin.list_display = ('title',)
+        cl = self.changelist()
+        self.assertEqual(cl.get_only_fields(), ['title', 'id'])
+        book = cl.result_list[0]
+        self.assertEqual(book.title, "Book 0")
+        self.assertIsNone(book.pages)
+
+    def test_declared_fields(self):
+        def double_pages(obj):
+            return obj.pages * 2
+        double_pages.admin_only_fields = ('pages',)
+        self.admin.list_display = ('title', double_pages)
+        cl = self.changelist()
+        self.assertEqual(cl.get_only_fields(), ['title', 'pages', 'id'])
+
+    def test_undeclared_fields(self):
+        self.admin.list_display = ('title', lambda obj: obj.pages * 2)
+        cl = self.changelist()
+        self.assertIsNone(cl.get_only_fields())
+        self.assertEqual(cl.result_list[0].pages, 0)
+
+    def test_keyset_pages(self):
+        self.admin.list_display = ('title',)
+        self.admin.paginator = KeysetPaginator
+        cl = self.changelist()
+        cl = self.changelist(cursor=cl.cursor_page.next_cursor)
+        self.assertEqual([b.title for b in cl.result_list],
+                         ["Book %d" % i for i in range(5, 10)])
+
+
+class SelectRelatedTest(MongoTestCase):
+
+    def setUp(self):
+        Book.drop_collection()
+        Review.drop_collection()
+        for i in range(5):
+            book = Book(title="Book %d" % i, pages=i).save()
+            Review(title="Review %d" % i, book=book).save()
+        self.admin = DocumentAdmin(Review, site)
+        self.admin.list_display = ('title', 'book')
+
+    def changelist(self):
+        request = RequestFactory().get('/')
+        return self.admin.get_changelist(request)(
+            request, Review, self.admin.list_display, ('title',), (), None, (),
+            self.admin.list_select_related, self.admin.list_per_page,
+            self.admin.list_max_show_all, (), self.admin)
+
+    def test_references_in_list_display(self):
+        # the count, the page and the books of the page
+        with self.assertNumMongoQueries(3):
+            cl = self.changelist()
+            books = [str(review.book) for review in cl.result_list]
+        self.assertEqual(books, ["Book %d" % i for i in range(5)])
+
+    def test_list_select_related(self):
+        self.admin.list_display = ('title',)
+        self.admin.list_select_related = ('book',)
+        cl = self.changelist()
+        self.assertEqual(cl.get_only_fields(), ['title', 'book', 'id'])
+        self.assertEqual(cl.queryset._prefetch_related_lookups, ('book',))
+
+
+class TextSearchTest(MongoTestCase):
+
+    def setUp(self):
+        Article.drop_collection()
+        for slug in ('mongo-text', 'mongo-regex', 'django'):
+            Article(title=slug.replace('-', ' '), body="", slug=slug).save()
+        self.admin = ArticleAdmin(Article, site)
+
+    def changelist(self, **params):
+        request = RequestFactory().get('/', params)
+        ChangeList = self.admin.get_changelist(request)
+        return ChangeList(
+            request, Article, self.admin.list_display, ('title',), (), None,
+            self.admin.search_fields, False, self.admin.list_per_page,
+            self.admin.list_max_show_all, (), self.admin)
+
+    def test_prefix_lookups(self):
+        self.admin.search_fields = ('^slug', '=title')
+        cl = self.changelist(q='mongo')
+        self.assertEqual(sorted(a.slug for a in cl.result_list),
+                         ['mongo-regex', 'mongo-text'])
+        query = cl.queryset._query
+        self.assertEqual(query['$or'][0]['slug'].pattern, '^mongo')
+        self.assertFalse(query['$or'][0]['slug'].flags & re.IGNORECASE)
+        self.assertEqual(query['$or'][1], {'title': 'mongo'})
+
+    def test_text_search(self):
+        self.admin.search_fields = ('title', 'body')
+        cl = self.changelist(q='mongo text')
+        self.assertEqual(cl.queryset._query,
+                         {'$text': {'$search': 'mongo text'}})
+        self.assertEqual(cl.queryset._ordering[0],
+                         ('_text_score', {'$meta': 'textScore'}))
+
+        # a picked column wins over the relevance
+        cl = self.changelist(q='mongo text', o='2')
+        self.assertEqual(cl.queryset._ordering[0], ('slug', 1))
+
+    def test_text_search_and_prefix_lookups(self):
+        cl = self.changelist(q='mongo')
+        clauses = cl.queryset._query['$or']
+        self.assertEqual(clauses[0], {'$text': {'$search': 'mongo'}})
+        self.assertEqual(clauses[1]['slug'].pattern, '^mongo')
+
+    def test_checks(self):
+        self.assertEqual(self.admin.check(), [])
+
+        class NoIndexAdmin(ArticleAdmin):
+            search_fields = ('slug', '^title', '^id')
+        errors = NoIndexAdmin(Article, site).check()
+        self.assertEqual([e.id for e in errors],
+                         ['mongo_admin.W002', 'mongo_admin.W001'])
+        # Django 1.8 checks the admin class
+        errors = DocumentAdminChecks()._check_search_mode(NoIndexAdmin, Article)
+        self.assertEqual([(e.id, e.obj) for e in errors],
+                         [('mongo_admin.W002', NoIndexAdmin),
+                          ('mongo_admin.W001', NoIndexAdmin)])
+
+        class UnknownFieldAdmin(ArticleAdmin):
+            search_fields = ('author__name',)
+        errors = UnknownFieldAdmin(Article, site).check()
+        self.assertEqual([e.id for e in errors], ['mongo_admin.W002'])
+
+        class BadModeAdmin(ArticleAdmin):
+            search_mode = 'full'
+        errors = BadModeAdmin(Article, site).check()
+        self.assertEqual([e.id for e in errors], ['mongo_admin.E001'])
+
+
+class DeleteTest(ChangeListTestCase):
+
+    def setUp(self):
+        super(DeleteTest, self).setUp()
+        self.admin.log = False
+        self.request = RequestFactory().post('/')
+
+    def test_delete_in_batches(self):
+        queryset = Book.objects.filter(pages__gte=5)
+        deleted = self.admin.delete_queryset(self.request, queryset,
+                                             batch_size=7)
+        self.assertEqual(deleted, 25)
+        self.assertEqual(sorted(Book.objects.scalar('pages')), list(range(5)))
+
+    @skipUnless(signals.signals_available, "blinker is not installed")
+    def test_delete_sends_signals(self):
+        deleted = []
+
+        def receiver(sender, document, **kwargs):
+            deleted.append(document.pages)
+        signals.pre_delete.connect(receiver, sender=Book)
+        try:
+            queryset = Book.objects.filter(pages__lt=3)
+            self.assertEqual(
+                self.admin.delete_queryset(self.request, queryset), 3)
+        finally:
+            signals.pre_delete.disconnect(receiver, sender=Book)
+        self.assertEqual(sorted(deleted), [0, 1, 2])
+        self.assertEqual(Book.objects.count(), 27)
+
+    def test_log_deletions(self):
+        from django.contrib.admin.models import LogEntry, DELETION
+        self.admin.log = True
+        self.request.user = Superuser()
+        logged = []
+        log_deletions = self.admin.log_deletions
+
+        def record(request, objects):
+            logged.extend(objects)
+            log_deletions(request, objects)
+        self.admin.log_deletions = record
+        entries = []
+        LogEntry.objects.bulk_create = entries.extend
+        try:
+            queryset = Book.objects.filter(pages__lt=3).order_by('pages')
+            self.assertEqual(self.admin.delete_queryset(
+                self.request, queryset, batch_size=2), 3)
+        finally:
+            del LogEntry.objects.bulk_create
+
+        # only the fields of the string of the documents are read
+        self.assertEqual([b.pages for b in logged], [None] * 3)
+        self.assertEqual([(e.object_id, e.object_repr) for e in entries],
+                         [(str(b.pk), b.title) for b in logged])
+        self.assertEqual([e.object_repr for e in entries],
+                         ["Book 0", "Book 1", "Book 2"])
+        self.assertEqual(set((e.user_id, e.action_flag) for e in entries),
+                         set([(1, DELETION)]))
+        self.assertEqual(Book.objects.count(), 27)
+
+
+@override_settings(ROOT_URLCONF='tests.mongo_admin.urls')
+class DeleteSelectedTest(ChangeListTestCase):
+
+    def setUp(self):
+        super(DeleteSelectedTest, self).setUp()
+        self.admin = BookAdmin(Book, urls.site)
+        self.admin.log = False
+
+    def delete_selected(self, data):
+        request = RequestFactory().post('/', data)
+        request.user = Superuser()
+        request._messages = CookieStorage(request)
+        response = delete_selected(self.admin, request,
+                                   Book.objects.filter(pages__lt=3))
+        return request, response
+
+    def test_confirmation(self):
+        request, response = self.delete_selected({})
+        response.render()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data['objects_name'], "Books")
+        self.assertEqual(response.context_data['model_count'],
+                         [("Books", 3)])
+        self.assertEqual(sorted(response.context_data['deletable_objects'][0]),
+                         ["Book: Book 0", "Book: Book 1", "Book: Book 2"])
+        self.assertContains(response, "Book: Book 2")
+        self.assertContains(response, helpers.ACTION_CHECKBOX_NAME)
+        for book in Book.objects.filter(pages__lt=3):
+            self.assertContains(response, 'value="%s"' % book.pk)
+        self.assertEqual(Book.objects.count(), 30)
+
+    def test_str_queryset(self):
+        queryset = str_queryset(Book.objects.filter(pages__lt=3))
+        books = list(queryset)
+        self.assertEqual([b.title for b in books], ["Book 0", "Book 1", "Book 2"])
+        self.assertEqual([b.pages for b in books], [None] * 3)
+        self.assertIsInstance(queryset, QuerySetNoCache)
+
+    def test_delete(self):
+        request, response = self.delete_selected({'post': 'yes'})
+        self.assertIsNone(response)
+        self.assertEqual([str(m) for m in request._messages],
+                         ["Successfully deleted 3 Books."])
+        self.assertEqual(Book.objects.count(), 27)
@@ -0,0 +1,16 @@
+#!/usr/bin/env python
+# coding=utf-8
+from __future__ import absolute_import, division, print_function
+
+from django.conf.urls import include, url
+
+from django_mongoengine.mongo_admin.sites import AdminSite
+
+from .models import Book
+
+site = AdminSite()
+site.register(Book)
+
+urlpatterns = [
+    url(r'^admin/', include(site.urls)),
+]
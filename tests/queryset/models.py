@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# coding=utf-8
+from __future__ import absolute_import, division, print_function
+
+from django_mongoengine import Document
+from django_mongoengine import fields
+
+
+class Person(Document):
+    name = fields.StringField(max_length=100)
+    age = fields.IntField()
+
+    def __unicode__(self):
+        return self.name or ''
+
+
+class Tag(Document):
+    name = fields.StringField(max_length=100)
+
+    def __unicode__(self):
+        return self.name or ''
+
+
+class Post(Document):
+    title = fields.StringField(max_length=100)
+    author = fields.ReferenceField(Person)
+    tags = fields.ListField(fields.ReferenceField(Tag), blank=True)
+
+    def __unicode__(self):
+        return self.title or ''
+
+
+class Counter(Document):
+    key = fields.StringField(max_length=100, unique=True)
+    hits = fields.IntField(default=0)
+
+
+class Event(Document):
+    name = fields.StringField(max_length=100)
+    day = fields.IntField()
+    hour = fields.IntField()
+
+    meta = {'get_latest_by': ['day', 'hour']}
+
+
+class Sale(Document):
+    region = fields.StringField(max_length=100)
+    product = fields.StringField(max_length=100)
+    amount = fields.IntField(blank=True)
@@ -0,0 +1,531 @@
+#!/usr/bin/env python
+# coding=utf-8
+from __future__ import absolute_import, division, print_function
+
+import threading
+
+from django.db.models import Avg, Count, Max, Min, Sum
+from django.db.models.fields import FieldDoesNotExist
+from django.test.utils import override_settings
+from mongoengine.connection import get_db, register_connection
+from mongoengine.errors import ValidationError
+from pymongo import ReadPreference
+
+from tests import MongoTestCase
+
+from .models import Counter, Event, Person, Post, Sale, Tag
+
+
+class CountingCollection(object):
+    """
+    Collection proxy which records the operations sent to the server.
+    """
+    def __init__(self, collection):
+        self.collection = collection
+        self.calls = []
+
+    def __getattr__(self, name):
+        attr = getattr(self.collection, name)
+        if name in ('find', 'find_one', 'count', 'aggregate',
+                    'find_one_and_update', 'insert_many', 'bulk_write'):
+            def wrapper(*args, **kwargs):
+                self.calls.append((name, args, kwargs))
+                return attr(*args, **kwargs)
+            return wrapper
+        return attr
+
+
+def counted(queryset):
+    collection = CountingCollection(queryset._collection_obj)
+    queryset._collection_obj = collection
+    return queryset, collection
+
+
+class ExistsTest(MongoTestCase):
+
+    def setUp(self):
+        Person.drop_collection()
+        Person(name="Ann", age=30).save()
+        Person(name="Bob", age=40).save()
+
+    def test_exists(self):
+        self.assertTrue(Person.objects.exists())
+        self.assertTrue(Person.objects(name="Bob").exists())
+        self.assertFalse(Person.objects(name="Carl").exists())
+        self.assertFalse(Person.objects.none().exists())
+
+    def test_exists_is_an_id_probe(self):
+        qs, collection = counted(Person.objects(age__gt=35))
+        self.assertTrue(qs.exists())
+        self.assertEqual(len(collection.calls), 1)
+        name, args, kwargs = collection.calls[0]
+        self.assertEqual(name, 'find')
+        self.assertEqual(list(kwargs['projection']), ['_id'])
+        # the probe must not fill the result cache
+        self.assertIsNone(qs._result_cache)
+
+    def test_exists_reuses_result_cache(self):
+        qs, collection = counted(Person.objects(name="Carl"))
+        list(qs)
+        self.assertEqual(len(collection.calls), 1)
+        self.assertFalse(qs.exists())
+        qs, collection = counted(Person.objects.all())
+        list(qs)
+        self.assertTrue(qs.exists())
+        self.assertEqual(len(collection.calls), 1)
+
+
+class IteratorTest(MongoTestCase):
+
+    def setUp(self):
+        Person.drop_collection()
+        for i in range(5):
+            Person(name="Person %d" % i, age=i).save()
+
+    def test_iterator_does_not_cache(self):
+        qs = Person.objects.order_by('age')
+        people = list(qs.iterator())
+        self.assertEqual([p.age for p in people], list(range(5)))
+        self.assertIsNone(qs._result_cache)
+
+    def test_iterator_chunk_size(self):
+        it = Person.objects.iterator(chunk_size=2)
+        self.assertEqual(it._batch_size, 2)
+        self.assertEqual(len(list(it)), 5)
+
+    def test_iterator_after_evaluation(self):
+        qs = Person.objects.all()
+        list(qs)
+        self.assertEqual(len(list(qs.iterator())), 5)
+
+
+class ValuesTest(MongoTestCase):
+
+    def setUp(self):
+        Person.drop_collection()
+        Person(name="Ann", age=30).save()
+        Person(name="Bob", age=40).save()
+
+    def test_values(self):
+        qs = Person.objects.order_by('age').values('name', 'age')
+        self.assertEqual(list(qs), [
+            {'name': 'Ann', 'age': 30},
+            {'name': 'Bob', 'age': 40},
+        ])
+        self.assertEqual(qs[1], {'name': 'Bob', 'age': 40})
+        rows = list(Person.objects.order_by('age').values())
+        self.assertEqual(sorted(rows[0]), ['age', 'id', 'name'])
+
+    def test_values_list(self):
+        qs = Person.objects.order_by('age')
+        self.assertEqual(list(qs.values_list('name', 'age')),
+                         [('Ann', 30), ('Bob', 40)])
+        self.assertEqual(list(qs.values_list('name', flat=True)),
+                         ['Ann', 'Bob'])
+        self.assertEqual(list(qs.values_list('age', flat=True).iterator()),
+                         [30, 40])
+        ann = Person.objects.get(name="Ann")
+        self.assertEqual(qs.values_list('pk', flat=True).first(), ann.pk)
+        self.assertRaises(TypeError, qs.values_list, 'name', 'age', flat=True)
+
+    def test_none(self):
+        qs = Person.objects.none()
+        self.assertEqual(list(qs.values('name')), [])
+        self.assertEqual(list(qs.values_list('name', flat=True).iterator()), [])
+        self.assertEqual(list(qs.iterator()), [])
+
+    def test_values_uses_projection(self):
+        qs, collection = counted(Person.objects.values_list('name'))
+        list(qs)
+        name, args, kwargs = collection.calls[0]
+        self.assertIn('name', kwargs['projection'])
+        self.assertNotIn('age', kwargs['projection'])
+
+
+class ModelStateTest(MongoTestCase):
+
+    def test_state_is_lazy(self):
+        Person.drop_collection()
+        Person(name="Ann", age=30).save()
+        person = Person.objects.get(name="Ann")
+        self.assertNotIn('_state', person.__dict__)
+        self.assertEqual(person._state.db, 'default')
+        self.assertIs(person._state, person._state)
+
+
+class PrefetchRelatedTest(MongoTestCase):
+
+    def setUp(self):
+        for doc in (Person, Tag, Post):
+            doc.drop_collection()
+        ann = Person(name="Ann", age=30).save()
+        bob = Person(name="Bob", age=40).save()
+        red = Tag(name="red").save()
+        blue = Tag(name="blue").save()
+        for i in range(6):
+            Post(title="Post %d" % i, author=[ann, bob][i % 2],
+                 tags=[red, blue][:i % 3]).save()
+        self.collections = {}
+        for doc in (Person, Tag):
+            self.collections[doc] = doc._collection = CountingCollection(
+                doc._get_collection())
+
+    def tearDown(self):
+        for doc, collection in self.collections.items():
+            doc._collection = collection.collection
+        super(PrefetchRelatedTest, self).tearDown()
+
+    def test_prefetch_related(self):
+        posts = list(Post.objects.order_by('title')
+                     .prefetch_related('author', 'tags'))
+        self.assertEqual(len(self.collections[Person].calls), 1)
+        self.assertEqual(len(self.collections[Tag].calls), 1)
+        for post in posts:
+            self.assertIsInstance(post._data['author'], Person)
+        self.assertEqual([p.author.name for p in posts],
+                         ["Ann", "Bob"] * 3)
+        self.assertEqual([[t.name for t in p.tags] for p in posts],
+                         [[], ["red"], ["red", "blue"]] * 2)
+
+    def test_select_related(self):
+        qs = Post.objects.select_related()
+        self.assertEqual(qs._prefetch_related_lookups, ('author', 'tags'))
+        self.assertTrue(qs.query.select_related)
+        self.assertEqual(qs.select_related(None)._prefetch_related_lookups, ())
+
+    def test_invalid_lookup(self):
+        self.assertRaises(ValueError, Post.objects.prefetch_related, 'title')
+
+
+class GetOrCreateTest(MongoTestCase):
+
+    def setUp(self):
+        Person.drop_collection()
+        Counter.drop_collection()
+        Counter.ensure_indexes()
+
+    def test_get_or_create(self):
+        qs, collection = counted(Person.objects.all())
+        ann, created = qs.get_or_create(name="Ann", defaults={'age': 30})
+        self.assertTrue(created)
+        self.assertIsNotNone(ann.pk)
+        self.assertEqual(Person.objects.get(pk=ann.pk).age, 30)
+        again, created = qs.get_or_create(name="Ann", defaults={'age': 99})
+        self.assertFalse(created)
+        self.assertEqual([c[0] for c in collection.calls],
+                         ['find_one_and_update', 'find_one_and_update', 'find'])
+        self.assertEqual(again.pk, ann.pk)
+        self.assertEqual(again.age, 30)
+        self.assertEqual(Person.objects.count(), 1)
+
+    def test_update_or_create(self):
+        ann, created = Person.objects.update_or_create(
+            name="Ann", defaults={'age': 30})
+        self.assertTrue(created)
+        again, created = Person.objects.update_or_create(
+            name="Ann", defaults={'age': 31})
+        self.assertFalse(created)
+        self.assertEqual(again.pk, ann.pk)
+        self.assertEqual(again.age, 31)
+        self.assertEqual(Person.objects.get(pk=ann.pk).age, 31)
+
+    def test_get_or_create_existing(self):
+        ann = Person.objects.create(name="Ann", age=30)
+        # age is required, but only a new document has to be valid
+        again, created = Person.objects.get_or_create(name="Ann")
+        self.assertFalse(created)
+        self.assertEqual(again.pk, ann.pk)
+        self.assertRaises(ValidationError, Person.objects.get_or_create,
+                          name="Bob")
+
+    def test_update_or_create_none(self):
+        ann = Person.objects.create(name="Ann", age=30)
+        again, created = Person.objects.update_or_create(
+            name="Ann", defaults={'age': None})
+        self.assertFalse(created)
+        self.assertIsNone(again.age)
+        self.assertIsNone(Person.objects.get(pk=ann.pk).age)
+
+    def test_get_or_create_duplicates(self):
+        Person.objects.create(name="Ann", age=30)
+        Person.objects.create(name="Ann", age=40)
+        self.assertRaises(Person.MultipleObjectsReturned,
+                          Person.objects.get_or_create, name="Ann")
+        self.assertRaises(Person.MultipleObjectsReturned,
+                          Person.objects.get_or_create, name="Ann",
+                          defaults={'age': 50})
+        self.assertRaises(Person.MultipleObjectsReturned,
+                          Person.objects.update_or_create, name="Ann",
+                          defaults={'age': 50})
+        self.assertEqual(sorted(Person.objects.values_list('age', flat=True)),
+                         [30, 40])
+
+    def test_concurrent_get_or_create(self):
+        results = []
+
+        def hammer():
+            for i in range(10):
+                results.append(Counter.objects.get_or_create(key="hot"))
+
+        threads = [threading.Thread(target=hammer) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), 80)
+        self.assertEqual(Counter.objects(key="hot").count(), 1)
+        self.assertEqual(len([r for r in results if r[1]]), 1)
+        self.assertEqual(len(set(r[0].pk for r in results)), 1)
+
+
+class BulkTest(MongoTestCase):
+
+    def setUp(self):
+        Person.drop_collection()
+
+    def test_bulk_create(self):
+        people = [Person(name="Person %d" % i, age=i) for i in range(7)]
+        qs, collection = counted(Person.objects.all())
+        created = qs.bulk_create(people, batch_size=3)
+        self.assertEqual(created, people)
+        self.assertEqual([c[0] for c in collection.calls], ['insert_many'] * 3)
+        self.assertTrue(all(p.pk is not None for p in people))
+        self.assertEqual(Person.objects.count(), 7)
+        self.assertEqual(Person.objects.get(pk=people[4].pk).age, 4)
+
+    def test_bulk_create_validates(self):
+        self.assertRaises(ValidationError, Person.objects.bulk_create,
+                          [Person(name="x" * 101, age=1)])
+        self.assertEqual(Person.objects.count(), 0)
+
+    def test_bulk_update(self):
+        people = Person.objects.bulk_create(
+            [Person(name="Person %d" % i, age=i) for i in range(5)])
+        for p in people:
+            p.age += 10
+            p.name = "changed"
+        self.assertEqual(Person.objects.bulk_update(people, ['age']), 5)
+        self.assertEqual(
+            sorted(Person.objects.values_list('age', flat=True)),
+            list(range(10, 15)))
+        self.assertEqual(Person.objects(name="changed").count(), 0)
+        self.assertRaises(ValueError, Person.objects.bulk_update,
+                          people, ['id'])
+
+    def test_bulk_update_batches(self):
+        people = Person.objects.bulk_create(
+            [Person(name="Person %d" % i, age=i) for i in range(5)])
+        for p in people:
+            p.age += 10
+        qs, collection = counted(Person.objects.all())
+        self.assertEqual(qs.bulk_update(people, ['age'], batch_size=2), 5)
+        self.assertEqual([c[0] for c in collection.calls], ['bulk_write'] * 3)
+        self.assertEqual(
+            sorted(Person.objects.values_list('age', flat=True)),
+            list(range(10, 15)))
+        self.assertEqual(Person.objects.bulk_update([], ['age']), 0)
+
+    def test_bulk_update_custom_pk(self):
+        tags = Tag.objects.bulk_create([Tag(name="a"), Tag(name="b")])
+        for tag in tags:
+            # a string pk, as read from a form or url
+            tag.id = str(tag.id)
+            tag.name += "!"
+        self.assertEqual(Tag.objects.bulk_update(tags, ['name']), 2)
+        self.assertEqual(sorted(Tag.objects.values_list('name', flat=True)),
+                         ["a!", "b!"])
+
+
+class LatestTest(MongoTestCase):
+
+    def setUp(self):
+        Event.drop_collection()
+        Event(name="a", day=1, hour=5).save()
+        Event(name="b", day=2, hour=1).save()
+        Event(name="c", day=2, hour=3).save()
+
+    def test_latest(self):
+        self.assertEqual(Event.objects.latest().name, "c")
+        self.assertEqual(Event.objects.earliest().name, "a")
+        self.assertEqual(Event.objects.latest('hour').name, "a")
+        self.assertEqual(Event.objects.latest('day', '-hour').name, "b")
+        self.assertEqual(Event.objects.earliest('-day', 'hour').name, "b")
+
+    def test_latest_only(self):
+        event = Event.objects.latest('day', 'hour', only=['name'])
+        self.assertEqual(event.name, "c")
+        self.assertIsNone(event.day)
+
+    def test_latest_does_not_exist(self):
+        self.assertRaises(Event.DoesNotExist,
+                          Event.objects(name="x").latest)
+        self.assertRaises(ValueError, Person.objects.latest)
+
+
+class AggregateTest(MongoTestCase):
+
+    def setUp(self):
+        Sale.drop_collection()
+        for region, product, amount in [("north", "tea", 10),
+                                        ("north", "tea", 20),
+                                        ("north", "cake", 5),
+                                        ("south", "tea", 7),
+                                        ("south", "cake", None)]:
+            Sale(region=region, product=product, amount=amount).save()
+
+    def test_aggregate(self):
+        self.assertEqual(Sale.objects.aggregate(Sum('amount'), Max('amount')),
+                         {'amount__sum': 42, 'amount__max': 20})
+        self.assertEqual(
+            Sale.objects(region="north").aggregate(
+                total=Sum('amount'), avg=Avg('amount'), low=Min('amount'),
+                n=Count('id'), priced=Count('amount'),
+                products=Count('product', distinct=True)),
+            {'total': 35, 'avg': 35 / 3.0, 'low': 5, 'n': 3, 'priced': 3,
+             'products': 2})
+        self.assertEqual(Sale.objects(region="east").aggregate(
+            total=Sum('amount'), n=Count('id')), {'total': None, 'n': 0})
+
+    def test_none(self):
+        qs = Sale.objects.none()
+        self.assertEqual(qs.aggregate(Sum('amount'), Count('id')),
+                         {'amount__sum': None, 'id__count': 0})
+        qs = qs.values('region').annotate(total=Sum('amount'))
+        self.assertEqual(list(qs), [])
+        self.assertEqual(qs.count(), 0)
+        self.assertEqual(list(qs.iterator()), [])
+
+    def test_aggregate_pipeline(self):
+        rows = list(Sale.objects.aggregate({'$match': {'region': 'south'}}))
+        self.assertEqual(len(rows), 2)
+
+    def test_annotate(self):
+        qs = Sale.objects.values('region').annotate(total=Sum('amount'))
+        self.assertEqual(list(qs.order_by('region')), [
+            {'region': 'north', 'total': 35},
+            {'region': 'south', 'total': 7},
+        ])
+        self.assertEqual(qs.count(), 2)
+        self.assertEqual(qs.order_by('-total')[0],
+                         {'region': 'north', 'total': 35})
+        rows = (Sale.objects.values_list('region', 'product')
+                .annotate(n=Count('id')).order_by('region', 'product'))
+        self.assertEqual(list(rows), [('north', 'cake', 1), ('north', 'tea', 2),
+                                      ('south', 'cake', 1), ('south', 'tea', 1)])
+        self.assertEqual(list(rows[1:3].iterator()),
+                         [('north', 'tea', 2), ('south', 'cake', 1)])
+        self.assertRaises(NotImplementedError, Sale.objects.annotate,
+                          n=Count('id'))
+
+
+class QueryCountTest(MongoTestCase):
+
+    def setUp(self):
+        Person.drop_collection()
+        Person(name="Ann", age=30).save()
+
+    def test_assert_num_mongo_queries(self):
+        with self.assertNumMongoQueries(1) as captured:
+            Person.objects(name="Ann").exists()
+        self.assertEqual(captured[0]['command'], 'find')
+        self.assertEqual(captured[0]['collection'], 'person')
+        self.assertEqual(captured[0]['alias'], 'default')
+        self.assertNumMongoQueries(2, lambda: (Person.objects.count(),
+                                               Person.objects.first()))
+
+
+class ReplicaRouter(object):
+
+    def db_for_read(self, document, **hints):
+        if document is Person:
+            return 'replica'
+
+    def read_preference(self, document, **hints):
+        return ReadPreference.SECONDARY_PREFERRED
+
+
+@override_settings(MONGODB_ROUTERS=[ReplicaRouter])
+class RouterTest(MongoTestCase):
+
+    def setUp(self):
+        register_connection('replica', name='django_mongoengine_test_replica')
+        Person.drop_collection()
+        get_db('replica').drop_collection('person')
+        Person(name="Ann", age=30).save()
+
+    def tearDown(self):
+        super(RouterTest, self).tearDown()
+        get_db('replica').drop_collection('person')
+
+    def test_reads_are_routed(self):
+        collection = Person.objects.all()._collection
+        self.assertEqual(collection.database.name,
+                         'django_mongoengine_test_replica')
+        self.assertEqual(collection.read_preference,
+                         ReadPreference.SECONDARY_PREFERRED)
+        self.assertEqual(Person.objects.count(), 0)
+        self.assertEqual(Person.objects.using('default').count(), 1)
+        self.assertEqual(Person.objects.for_write().count(), 1)
+
+    def test_writes_are_not_routed(self):
+        self.assertEqual(Person.objects(name="Ann").update(set__age=31), 1)
+        Person.objects.bulk_create([Person(name="Bob", age=40)])
+        self.assertEqual(
+            list(Person.objects.for_write().order_by('name').values_list(
+                'age', flat=True)), [31, 40])
+        self.assertEqual(Person.objects.count(), 0)
+
+    def test_writes_leave_queryset_reads_routed(self):
+        qs = Person.objects(name="Ann")
+        qs.update(set__age=31)
+        qs.get_or_create(name="Ann", defaults={'age': 1})
+        qs.bulk_update(list(qs.for_write()), ['age'])
+        self.assertFalse(qs._for_write)
+        self.assertEqual(qs.count(), 0)
+
+    def test_read_preference_only(self):
+        collection = Tag.objects.all()._collection
+        self.assertEqual(collection.database.name, 'django_mongoengine_test')
+        self.assertEqual(collection.read_preference,
+                         ReadPreference.SECONDARY_PREFERRED)
+        self.assertEqual(Tag.objects.for_write()._collection.read_preference,
+                         ReadPreference.PRIMARY)
+
+
+class MetaWrapperTest(MongoTestCase):
+
+    def test_fields(self):
+        opts = Post._meta
+        self.assertEqual([f.name for f in opts.fields],
+                         ['id', 'title', 'author', 'tags'])
+        self.assertIs(opts.concrete_fields, opts.fields)
+        self.assertIs(opts.get_field('title'), Post._fields['title'])
+        self.assertEqual(opts.pk.name, 'id')
+        self.assertEqual((opts.app_label, opts.model_name), ('queryset', 'post'))
+
+    def test_meta_dict_fallthrough(self):
+        opts = Post._meta
+        self.assertEqual(opts.id_field, 'id')
+        self.assertEqual(opts['collection'], 'post')
+        self.assertRaises(AttributeError, getattr, opts, 'no_such_option')
+
+    def test_field_index(self):
+        opts = Post._meta
+        author = Post._fields['author']
+        self.assertIs(opts.get_field('author'), author)
+        self.assertIs(opts.get_field('_id'), Post._fields['id'])
+        self.assertEqual(opts.get_field_by_name('author'),
+                         (author, None, True, False))
+        self.assertEqual(opts.get_field_by_name('person'),
+                         (author, Person, False, False))
+        self.assertRaises(FieldDoesNotExist, opts.get_field, 'nope')
+
+    def test_admin_lookups(self):
+        from django_mongoengine.mongo_admin.util import (
+            help_text_for_field, label_for_field)
+        self.assertEqual(label_for_field('author', Post), 'author')
+        self.assertIsNone(help_text_for_field('author', Post))
+        self.assertEqual(help_text_for_field('nope', Post), '')
+        post = Post(title='x', author=Person(name='Ann', age=1))
+        self.assertEqual(post.serializable_value('title'), 'x')
+        self.assertEqual(post.serializable_value('pk'), None)
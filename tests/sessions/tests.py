@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# coding=utf-8
+from __future__ import absolute_import, division, print_function
+
+from django.contrib.sessions.backends.base import CreateError
+from django.core.cache import caches
+from django.core.management import call_command
+from django.utils.six import StringIO
+from django.test.utils import override_settings
+
+from bson import Binary
+
+from django_mongoengine.sessions import (
+    BINARY_PLAIN, BINARY_ZLIB, BSONBinarySerializer, MongoSession, SessionStore,
+)
+from django_mongoengine import sessions_cached
+
+from tests import MongoTestCase
+
+
+class SessionStoreTest(MongoTestCase):
+    backend = SessionStore
+
+    def setUp(self):
+        MongoSession.drop_collection()
+        caches['default'].clear()
+        self.session = self.backend()
+
+    def test_save_and_load(self):
+        self.session['cat'] = 'dog'
+        self.session.save()
+        session = self.backend(self.session.session_key)
+        self.assertEqual(session['cat'], 'dog')
+        self.assertTrue(session.exists(self.session.session_key))
+
+    def test_unknown_key(self):
+        session = self.backend('unknown')
+        self.assertEqual(session.load(), {})
+        self.assertIsNone(session.session_key)
+        self.assertFalse(session.exists('unknown'))
+
+    def test_delete(self):
+        self.session['cat'] = 'dog'
+        self.session.save()
+        key = self.session.session_key
+        self.session.delete()
+        self.assertFalse(self.backend().exists(key))
+        self.assertEqual(self.backend(key).load(), {})
+
+    def test_cycle_key(self):
+        self.session['cat'] = 'dog'
+        self.session.save()
+        old_key = self.session.session_key
+        self.session.cycle_key()
+        self.assertNotEqual(self.session.session_key, old_key)
+        self.assertFalse(self.backend().exists(old_key))
+        self.assertEqual(self.backend(self.session.session_key)['cat'], 'dog')
+
+    def test_load_and_exists_use_projections(self):
+        self.session['cat'] = 'dog'
+        self.session.save()
+        key = self.session.session_key
+        caches['default'].clear()
+        with self.assertNumMongoQueries(2) as captured:
+            self.assertEqual(self.backend(key)['cat'], 'dog')
+            self.assertTrue(SessionStore().exists(key))
+        load, exists = [q['query'] for q in captured]
+        self.assertEqual(load['limit'], 1)
+        self.assertTrue(load['projection']['session_data'])
+        self.assertNotIn('session_key', load['projection'])
+        self.assertEqual(exists['projection'], {'_id': True})
+
+    def test_expired(self):
+        self.session['cat'] = 'dog'
+        self.session.set_expiry(-1)
+        self.session.save()
+        self.assertEqual(self.backend(self.session.session_key).load(), {})
+
+    def test_must_create_existing_key(self):
+        self.session.save()
+        session = self.backend(self.session.session_key)
+        self.assertRaises(CreateError, session.save, must_create=True)
+
+    @override_settings(SESSION_SAVE_EVERY_REQUEST=True)
+    def test_save_unchanged_only_updates_expiry(self):
+        self.session['cat'] = 'dog'
+        self.session.save()
+        key = self.session.session_key
+        before = MongoSession.objects.get(session_key=key)
+
+        session = self.backend(key)
+        self.assertEqual(session['cat'], 'dog')
+        session.encode = lambda data: self.fail("unchanged data was encoded")
+        session.save()
+
+        after = MongoSession.objects.get(session_key=key)
+        self.assertEqual(after.session_data, before.session_data)
+        self.assertGreaterEqual(after.expire_date, before.expire_date)
+
+    @override_settings(SESSION_SAVE_EVERY_REQUEST=True)
+    def test_save_unmodified_changed_data(self):
+        self.session['cats'] = ['tom']
+        self.session.save()
+        key = self.session.session_key
+
+        session = self.backend(key)
+        session['cats'].append('felix')
+        self.assertFalse(session.modified)
+        session.save()
+        self.assertEqual(self.backend(key)['cats'], ['tom', 'felix'])
+
+    def test_save_deleted_session(self):
+        self.session['cat'] = 'dog'
+        self.session.save()
+        MongoSession.objects.delete()
+        self.session.save()
+        self.assertEqual(self.backend(self.session.session_key)['cat'], 'dog')
+
+
+class CachedSessionStoreTest(SessionStoreTest):
+    backend = sessions_cached.SessionStore
+
+    def test_load_from_cache(self):
+        self.session['cat'] = 'dog'
+        self.session.save()
+        key = self.session.session_key
+        # the plain backend needs a round-trip per request ...
+        self.assertNumMongoQueries(
+            1, lambda: SessionStore(key).load())
+        # ... the cached one none once the session is cached
+        with self.assertNumMongoQueries(0):
+            self.assertEqual(self.backend(key)['cat'], 'dog')
+            self.assertTrue(self.backend().exists(key))
+
+    def test_load_fills_cache(self):
+        self.session['cat'] = 'dog'
+        self.session.save()
+        key = self.session.session_key
+        caches['default'].clear()
+        self.assertEqual(self.backend(key)['cat'], 'dog')
+        self.assertIn(sessions_cached.KEY_PREFIX + key, caches['default'])
+
+
+class ClearExpiredTest(MongoTestCase):
+
+    def setUp(self):
+        MongoSession.drop_collection()
+        for expiry in (-10, -10, -10, -10, -10, 300, 300):
+            session = SessionStore()
+            session.set_expiry(expiry)
+            session.save()
+
+    def test_clear_expired(self):
+        self.assertEqual(SessionStore.clear_expired(batch_size=2), 5)
+        self.assertEqual(MongoSession.objects.count(), 2)
+        self.assertEqual(SessionStore.clear_expired(), 0)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('clearmongosessions', count=True, stdout=out)
+        self.assertEqual(out.getvalue(), "7 sessions, 5 expired\n")
+        self.assertEqual(MongoSession.objects.count(), 7)
+
+        out = StringIO()
+        call_command('clearmongosessions', batch_size=3, stdout=out)
+        self.assertIn("Deleted 5 expired sessions", out.getvalue())
+        self.assertEqual(MongoSession.objects.count(), 2)
+
+
+class BinarySessionTest(MongoTestCase):
+    data = {'cart': list(range(200)), 'user': 'joe'}
+
+    def setUp(self):
+        MongoSession.drop_collection()
+
+    def store(self, session_key=None, compress_threshold=None):
+        session = SessionStore(session_key)
+        session.data_encode = 'binary'
+        session.compress_threshold = compress_threshold
+        return session
+
+    def raw_session_data(self, session_key):
+        return MongoSession._get_collection().find_one(
+            {'_id': session_key})['session_data']
+
+    def test_round_trip(self):
+        for threshold, flag in ((None, BINARY_PLAIN), (100, BINARY_ZLIB)):
+            session = self.store(compress_threshold=threshold)
+            session.update(self.data)
+            session.save()
+            raw = Binary(self.raw_session_data(session.session_key))
+            self.assertEqual(raw[20:21], flag)
+            self.assertEqual(dict(self.store(session.session_key)), self.data)
+
+    def test_smaller_than_strings(self):
+        session = SessionStore()
+        binary = self.store()
+        compressed = self.store(compress_threshold=100)
+        sizes = [len(s._encode_session(self.data))
+                 for s in (session, binary, compressed)]
+        self.assertLess(sizes[1], sizes[0])
+        self.assertLess(sizes[2], sizes[1])
+
+    def test_bson_serializer(self):
+        session = self.store()
+        session.serializer = BSONBinarySerializer
+        self.assertEqual(
+            session.decode_binary(session.encode_binary(self.data)), self.data)
+
+    def test_reads_string_sessions(self):
+        session = SessionStore()
+        session.update(self.data)
+        session.save()
+        self.assertEqual(dict(self.store(session.session_key)), self.data)
+
+    def test_tampered(self):
+        session = self.store()
+        session.update(self.data)
+        session.save()
+        raw = bytearray(self.raw_session_data(session.session_key))
+        raw[-2] ^= 1
+        MongoSession._get_collection().update_one(
+            {'_id': session.session_key},
+            {'$set': {'session_data': Binary(bytes(raw))}})
+        self.assertEqual(self.store(session.session_key).load(), {})
@@ -107,6 +107,46 @@ class ListViewTests(TestCase):
         # Custom pagination allows for 2 orphans on a page size of 5
         self.assertEqual(len(res.context['object_list']), 7)
 
+    def test_paginated_keyset(self):
+        self._make_authors(100)
+        url = '/list/authors/paginated/keyset/'
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        page = res.context['page_obj']
+        self.assertTrue(res.context['is_paginated'])
+        self.assertFalse(page.has_previous())
+        self.assertEqual(res.context['author_list'][0].name, 'Author 00')
+
+        for first, last in ((30, 59), (60, 89), (90, 99)):
+            res = self.client.get(url, {'cursor': page.next_cursor})
+            self.assertEqual(res.status_code, 200)
+            page = res.context['page_obj']
+            self.assertEqual(
+                [a.name for a in res.context['author_list']],
+                ['Author %02i' % i for i in range(first, last + 1)])
+        self.assertFalse(page.has_next())
+
+        res = self.client.get(url, {'cursor': page.previous_cursor})
+        page = res.context['page_obj']
+        self.assertEqual(res.context['author_list'][0].name, 'Author 60')
+        self.assertTrue(page.has_next())
+        self.assertTrue(page.has_previous())
+
+    def test_paginated_keyset_skips_nothing(self):
+        self._make_authors(100)
+        url = '/list/authors/paginated/keyset/'
+        cursor = self.client.get(url).context['page_obj'].next_cursor
+        with self.assertNumMongoQueries(1) as captured:
+            res = self.client.get(url, {'cursor': cursor})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn('skip', captured[0]['query'])
+
+    def test_paginated_keyset_invalid_cursor(self):
+        self._make_authors(10)
+        res = self.client.get('/list/authors/paginated/keyset/',
+                              {'cursor': 'frog'})
+        self.assertEqual(res.status_code, 404)
+
     def test_paginated_non_queryset(self):
         res = self.client.get('/list/dict/paginated/')
         self.assertEqual(res.status_code, 200)
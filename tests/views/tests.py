@@ -49,5 +49,5 @@ class TestCase(MongoTestCase):
 
 from .base import *   # noqa
 from .detail import * # noqa
-from .edit import *   # noqa
 from .list import *   # noqa
+from .edit import *   # noqa
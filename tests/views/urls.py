@@ -7,6 +7,8 @@ from django.views.decorators.cache import cache_page
 
 from django.views.generic import TemplateView
 
+from django_mongoengine.paginator import KeysetPaginator
+
 from . import views
 
 urlpatterns = [
@@ -104,4 +106,7 @@ urlpatterns = [
                               paginator_class=views.CustomPaginator)),
     url(r'^list/authors/paginated/custom_constructor/$',
      views.AuthorListCustomPaginator.as_view()),
+    url(r'^list/authors/paginated/keyset/$',
+     views.AuthorList.as_view(paginate_by=30,
+                              paginator_class=KeysetPaginator)),
 ]